@@ -1,8 +1,5 @@
 import streamlit as st
-import subprocess
 import time
-import requests
-import json
 
 # Set page config
 st.set_page_config(
@@ -18,13 +15,21 @@ st.write("A mock API service for healthcare data")
 # Start FastAPI server in a subprocess
 @st.cache_resource
 def start_fastapi():
+    import subprocess
     process = subprocess.Popen(
         ["python", "-m", "uvicorn", "main:app", "--host", "0.0.0.0", "--port", "8000"],
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE
     )
-    # Give it a moment to start
-    time.sleep(2)
+    # Wait until the port accepts connections rather than sleeping a fixed time
+    import socket
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            socket.create_connection(("localhost", 8000), timeout=0.1).close()
+            break
+        except OSError:
+            time.sleep(0.02)
     return process
 
 # Start the server
@@ -35,10 +40,18 @@ st.subheader("API Status")
 status_placeholder = st.empty()
 
 # Check if FastAPI server is running
-try:
+import asyncio
+import httpx
+from client import MockClient
+
+async def docs_status():
     # This is the URL of your FastAPI server running locally
-    response = requests.get("http://localhost:8000/docs")
-    if response.status_code == 200:
+    async with MockClient("http://localhost:8000") as mock:
+        return await mock.status("/docs")
+
+try:
+    status_code = asyncio.run(docs_status())
+    if status_code == 200:
         status_placeholder.success("✅ FastAPI server is running!")
         st.markdown("""
         ### API Documentation
@@ -48,8 +61,8 @@ try:
         - Alternative docs: [http://localhost:8000/redoc](http://localhost:8000/redoc)
         """)
     else:
-        status_placeholder.error(f"❌ FastAPI returned status code: {response.status_code}")
-except requests.exceptions.RequestException as e:
+        status_placeholder.error(f"❌ FastAPI returned status code: {status_code}")
+except httpx.HTTPError as e:
     status_placeholder.error(f"❌ Could not connect to FastAPI server: {str(e)}")
     st.error("""
     The FastAPI server failed to start. Here are some things to check:
@@ -0,0 +1,88 @@
+"""Measure mock server cold start: process start to first response byte.
+
+Usage:
+    python bench_startup.py                 # 5 cold starts of `uvicorn main:app`
+    python bench_startup.py --runs 10 --path /searchMemberById/m-a
+    python bench_startup.py --imports       # import-time profile of main + create_app()
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_byte(path: str, timeout: float = 30.0) -> float:
+    """Start a fresh server and return seconds until the first byte of ``path`` arrives."""
+    port = _free_port()
+    request = f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n".encode()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=timeout) as sock:
+                    sock.sendall(request)
+                    if sock.recv(1):
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.001)
+        raise TimeoutError(f"server did not answer within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def import_report(top: int = 20):
+    """Print the slowest imports (cumulative) for importing main and building the app."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main; main.create_app()"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        try:
+            rows.append((int(fields[1]), int(fields[0]), fields[2].rstrip()))
+        except ValueError:
+            continue
+    rows.sort(reverse=True)
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for cumulative, own, module in rows[:top]:
+        print(f"{cumulative / 1000:14.1f} {own / 1000:8.1f}  {module}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mock API cold start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/searchMemberById/m-a")
+    parser.add_argument("--imports", action="store_true", help="Print an import-time profile instead")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.imports:
+        import_report(args.top)
+        return
+
+    samples = [time_to_first_byte(args.path) * 1e3 for _ in range(args.runs)]
+    print(f"time to first byte for {args.path} over {args.runs} runs:")
+    print(f"  min {min(samples):.1f} ms  median {statistics.median(samples):.1f} ms  max {max(samples):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Byte-budgeted LRU cache for encoded response variants.
+
+Misses are built in the default thread pool so a large encode does not block
+the event loop, and concurrent requests for a key that is already being
+built wait on the same future instead of building it again (single-flight).
+A caller that is cancelled only stops waiting; the build still completes
+for the other waiters and is cached.
+"""
+import asyncio
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+DEFAULT_MAX_BYTES = int(os.environ.get("MOCK_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+DEFAULT_MAX_ENTRIES = 100_000
+
+
+class ResponseCache:
+    """LRU cache of encoded bodies bounded by total bytes and entry count."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._building: Dict[Hashable, asyncio.Future] = {}
+
+    async def get(self, key: Hashable, build: Callable[[], bytes]) -> bytes:
+        """Return the cached body for ``key``, building it at most once at a time."""
+        body = self._entries.get(key)
+        if body is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return body
+        building = self._building.get(key)
+        if building is not None:
+            self.coalesced += 1
+            return await asyncio.shield(building)
+
+        self.misses += 1
+        loop = asyncio.get_running_loop()
+        # The build belongs to no single caller: one that disconnects stops
+        # waiting, while the build finishes for everyone else and the cache
+        building = self._building[key] = loop.run_in_executor(None, build)
+        building.add_done_callback(lambda future: self._built(key, future))
+        return await asyncio.shield(building)
+
+    def _built(self, key: Hashable, future: asyncio.Future):
+        del self._building[key]
+        if future.cancelled():
+            return
+        # Checking the exception also marks it retrieved when no caller is left to
+        if future.exception() is None:
+            self._store(key, future.result())
+
+    def _store(self, key: Hashable, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        self._entries[key] = body
+        self.bytes += len(body)
+        while self.bytes > self.max_bytes or len(self._entries) > self.max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= len(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "maxBytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hitRatio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
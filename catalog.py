@@ -0,0 +1,99 @@
+"""Endpoint catalog for ``/`` and the cached OpenAPI document.
+
+The catalog is derived from the scenario registry on the first request after
+the registry changed, encoded once, and served in pages sliced out of the
+encoded entries. The OpenAPI schema only depends on the routes, so its
+encoded bytes are built on the first request and reused for the app's life.
+"""
+from typing import Dict, Optional
+
+from pagination import MAX_LIMIT, EncodedList, decode_cursor, encode_cursor
+from scenarios import ACCUM, COVERAGE, MEMBER, ScenarioRegistry, encode
+
+# Lookup path serving each kind of scenario
+ENDPOINTS = {
+    MEMBER: "/searchMemberById",
+    COVERAGE: "/searchCoverageById",
+    ACCUM: "/searchAccums",
+}
+
+# Entries on ``/`` when no page is requested; a larger catalog is cut here
+DEFAULT_PAGE_SIZE = 100
+
+# Entries only ever keep their position (replacing a scenario keeps its slot),
+# so a cursor stays valid across registry changes
+_CURSOR_CHECKSUM = 0
+
+
+class Catalog:
+    """Encoded ``/`` listing of every registered scenario endpoint."""
+
+    def __init__(self, registry: ScenarioRegistry, message: str, version: str):
+        self.registry = registry
+        self._head = b"".join((
+            b'{"message":', encode(message), b',"version":', encode(version), b',"endpoints":[',
+        ))
+        self._version = -1
+        self._entries: Optional[EncodedList] = None
+        self._default: Optional[bytes] = None
+
+    def entries(self) -> EncodedList:
+        self.registry.load()
+        if self._entries is None or self._version != self.registry.version:
+            self._entries = EncodedList([
+                {
+                    "path": f"{ENDPOINTS[scenario.kind]}/{scenario.scenario_id}",
+                    "methods": ["GET"],
+                    "description": scenario.description,
+                }
+                for scenario in self.registry.scenarios()
+            ])
+            self._version = self.registry.version
+            self._default = None
+        return self._entries
+
+    def page(self, limit: Optional[int] = None, cursor: Optional[str] = None) -> bytes:
+        """Encoded catalog page.
+
+        Without ``limit`` or ``cursor`` this is the whole catalog, or its first
+        ``DEFAULT_PAGE_SIZE`` entries plus ``nextCursor`` when it is larger.
+        """
+        entries = self.entries()
+        if limit is None and cursor is None:
+            if self._default is None:
+                self._default = self._page(entries, 0, DEFAULT_PAGE_SIZE, always_cursor=False)
+            return self._default
+        limit = DEFAULT_PAGE_SIZE if limit is None else limit
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+        start = 0 if cursor is None else decode_cursor(cursor, _CURSOR_CHECKSUM)
+        return self._page(entries, start, limit, always_cursor=True)
+
+    def _page(self, entries: EncodedList, start: int, limit: int, always_cursor: bool) -> bytes:
+        start = min(start, len(entries))
+        stop = min(start + limit, len(entries))
+        next_cursor = encode_cursor(stop, _CURSOR_CHECKSUM) if stop < len(entries) else None
+        tail = b"]}" if next_cursor is None and not always_cursor else b'],"nextCursor":' + encode(next_cursor) + b"}"
+        return b"".join((self._head, entries.slice(start, stop), tail))
+
+
+def serve_cached_openapi(app):
+    """Replace the app's ``/openapi.json`` route with one serving encoded bytes built once."""
+    from fastapi import Request, Response
+
+    cached: Dict[str, bytes] = {}
+
+    async def openapi(request: Request) -> Response:
+        root_path = request.scope.get("root_path", "").rstrip("/")
+        body = cached.get(root_path)
+        if body is None:
+            schema = app.openapi()
+            if root_path and app.root_path_in_servers:
+                servers = schema.get("servers", [])
+                if root_path not in {server.get("url") for server in servers}:
+                    schema = {**schema, "servers": [{"url": root_path}] + servers}
+            body = cached[root_path] = encode(schema)
+        return Response(content=body, media_type="application/json")
+
+    app.router.routes[:] = [route for route in app.router.routes if getattr(route, "path", None) != app.openapi_url]
+    app.add_route(app.openapi_url, openapi, include_in_schema=False)
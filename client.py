@@ -0,0 +1,176 @@
+"""Async client for the mock API, for app.py and for test suites.
+
+One ``MockClient`` keeps a pool of keep-alive connections and caps the
+requests in flight, so batch lookups run concurrently over a few reused
+connections instead of a new connection per call::
+
+    async with MockClient("http://localhost:8000") as mock:
+        member = await mock.member("m-a", fields="name")
+        accums = await mock.batch(ACCUM, ["acc-succ", "acc-f"])
+
+Pass ``app=`` instead of a URL to call an ASGI app in-process, without
+sockets or a server, which suits unit tests::
+
+    async with MockClient(app=main.create_app()) as mock:
+        ...
+"""
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Union
+
+import httpx
+
+from catalog import ENDPOINTS
+from scenarios import ACCUM, COVERAGE, MEMBER, RECORD_KEYS
+
+DEFAULT_BASE_URL = "http://localhost:8000"
+DEFAULT_CONCURRENCY = 64
+
+Payload = Dict[str, Any]
+
+
+class MockAPIError(Exception):
+    """The mock answered with an error status."""
+
+    def __init__(self, status_code: int, detail: Any):
+        super().__init__(f"{status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+class MockClient:
+    """Pooled async client with typed lookups, batch calls and a concurrency cap."""
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        app: Any = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        tenant: Optional[str] = None,
+        timeout: float = 10.0,
+    ):
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        headers = {"X-Mock-Tenant": tenant} if tenant else None
+        if app is not None:
+            transport = httpx.ASGITransport(app=app)
+            self.http = httpx.AsyncClient(transport=transport, base_url="http://mock", headers=headers)
+        else:
+            self.http = httpx.AsyncClient(base_url=base_url, limits=limits, headers=headers, timeout=timeout)
+        self._slots = asyncio.Semaphore(concurrency)
+
+    async def __aenter__(self) -> "MockClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.http.aclose()
+
+    async def request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        """Send one request within the concurrency cap and return the decoded JSON body."""
+        if params:
+            kwargs["params"] = {name: value for name, value in params.items() if value is not None}
+        async with self._slots:
+            response = await self.http.request(method, path, **kwargs)
+        if response.status_code >= 400:
+            try:
+                detail = response.json()
+            except ValueError:
+                detail = response.text
+            if isinstance(detail, dict):
+                detail = detail.get("detail", detail)
+            raise MockAPIError(response.status_code, detail)
+        return response.json()
+
+    async def status(self, path: str = "/docs") -> int:
+        """Status code of a GET, for readiness checks."""
+        async with self._slots:
+            response = await self.http.get(path)
+        return response.status_code
+
+    async def lookup(
+        self,
+        kind: str,
+        scenario_id: str,
+        fields: Optional[str] = None,
+        as_of: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Payload:
+        params = {"fields": fields, "asOf": as_of, "limit": limit, "cursor": cursor}
+        return await self.request("GET", f"{ENDPOINTS[kind]}/{scenario_id}", params)
+
+    async def member(
+        self,
+        member_id: str,
+        fields: Optional[str] = None,
+        as_of: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Payload:
+        """``GET /searchMemberById/{member_id}``"""
+        return await self.lookup(MEMBER, member_id, fields, as_of, limit, cursor)
+
+    async def coverage(
+        self,
+        coverage_id: str,
+        fields: Optional[str] = None,
+        as_of: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Payload:
+        """``GET /searchCoverageById/{coverage_id}``"""
+        return await self.lookup(COVERAGE, coverage_id, fields, as_of, limit, cursor)
+
+    async def accums(self, accum_id: str, fields: Optional[str] = None) -> Payload:
+        """``GET /searchAccums/{accum_id}``"""
+        return await self.lookup(ACCUM, accum_id, fields)
+
+    async def batch(
+        self,
+        kind: str,
+        scenario_ids: Sequence[str],
+        fields: Optional[str] = None,
+    ) -> List[Union[Payload, MockAPIError]]:
+        """Look up many scenarios concurrently; results keep the order of ``scenario_ids``.
+
+        An error response takes its item's place as a ``MockAPIError`` so one
+        missing ID does not fail the batch; transport errors are raised.
+        """
+        async def one(scenario_id: str) -> Union[Payload, MockAPIError]:
+            try:
+                return await self.lookup(kind, scenario_id, fields)
+            except MockAPIError as exc:
+                return exc
+        return list(await asyncio.gather(*(one(scenario_id) for scenario_id in scenario_ids)))
+
+    async def records(
+        self,
+        kind: str,
+        scenario_id: str,
+        fields: Optional[str] = None,
+        page_size: int = 100,
+    ) -> AsyncIterator[Payload]:
+        """Every record of a member or coverage scenario, following ``nextCursor``."""
+        cursor = None
+        while True:
+            page = await self.lookup(kind, scenario_id, fields, limit=page_size, cursor=cursor)
+            for record in page.get(RECORD_KEYS[kind], ()):
+                yield record
+            cursor = page.get("nextCursor")
+            if cursor is None:
+                return
+
+    async def search_members(self, limit: int = 100, name: Optional[str] = None, **criteria: str) -> List[Payload]:
+        """``GET /searchMembers``; criteria are indexed fields such as ``subscriberID``."""
+        body = await self.request("GET", "/searchMembers", {**criteria, "name": name, "limit": limit})
+        return body["members"]
+
+    async def search_coverages(self, limit: int = 100, **criteria: str) -> List[Payload]:
+        """``GET /searchCoverages``; criteria are indexed fields such as ``groupNumber``."""
+        body = await self.request("GET", "/searchCoverages", {**criteria, "limit": limit})
+        return body["coverages"]
+
+    async def register(self, kind: str, scenario_id: str, payload: Payload) -> Payload:
+        """``PUT /scenarios/{kind}/{scenario_id}``"""
+        return await self.request("PUT", f"/scenarios/{kind}/{scenario_id}", json=payload)
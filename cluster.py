@@ -0,0 +1,348 @@
+"""Sharded multi-node mode: scenario IDs are owned by nodes on a consistent-hash ring.
+
+Start each node with its own URL, a secret shared by all nodes, and any
+already running node as a seed::
+
+    export MOCK_CLUSTER_SECRET=change-me
+    MOCK_NODE_URL=http://127.0.0.1:8001 python -m uvicorn main:app --port 8001
+    MOCK_NODE_URL=http://127.0.0.1:8002 MOCK_CLUSTER_SEEDS=http://127.0.0.1:8001 \\
+        python -m uvicorn main:app --port 8002
+
+Lookups (``/searchMemberById``, ``/searchCoverageById``, ``/searchAccums``)
+and registrations (``PUT /scenarios/{kind}/{id}``) are forwarded over a
+pooled keep-alive client to the node owning the ID, so the public API is
+unchanged. When a node joins, every node pushes the runtime-registered
+scenarios it no longer owns, in every tenant, to their new owner. Index
+searches stay node-local. The node registering an accumulator sends its new
+state to every peer, and a joining node is sent the state of the runtime
+accumulators each peer owns, so ``/subscribeAccums`` works on any node.
+
+Peers mark forwarded requests with ``X-Mock-Forwarded: <secret>``; the
+header is only trusted (skipping forwarding and rate limits) when it
+carries this node's secret, and joining the ring requires it too.
+"""
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import re
+from bisect import bisect, insort
+from contextlib import asynccontextmanager
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from events import accumulator_event
+from scenarios import ACCUM, Scenario
+
+VIRTUAL_NODES = 128
+FORWARDED_HEADER = b"x-mock-forwarded"
+PUSH_CONCURRENCY = 16
+PUSH_ATTEMPTS = 5
+PUSH_BACKOFF_SECONDS = 0.2
+JOIN_BACKOFF_SECONDS = 0.5
+JOIN_MAX_BACKOFF_SECONDS = 30.0
+
+logger = logging.getLogger(__name__)
+
+# Paths that carry a shard key, and the group holding it
+_SHARDED_PATHS = re.compile(r"^/(?:searchMemberById|searchCoverageById|searchAccums|scenarios/[^/]+)/([^/]+)$")
+# Hop-by-hop headers, plus those invalidated by re-sending a fully read body
+_DROPPED_HEADERS = {
+    b"connection", b"keep-alive", b"transfer-encoding", b"upgrade", b"host",
+    b"content-length", b"content-encoding",
+}
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent-hash ring with virtual nodes."""
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = VIRTUAL_NODES):
+        self.replicas = replicas
+        self.nodes = set()
+        self._points: List[Tuple[int, str]] = []
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: str) -> bool:
+        if node in self.nodes:
+            return False
+        self.nodes.add(node)
+        for replica in range(self.replicas):
+            insort(self._points, (_hash(f"{node}#{replica}"), node))
+        return True
+
+    def owner(self, key: str) -> str:
+        position = bisect(self._points, (_hash(key), "")) % len(self._points)
+        return self._points[position][1]
+
+
+class Cluster:
+    """This node's view of the cluster plus the pooled client used to reach peers."""
+
+    def __init__(self, self_url: str, seeds: Iterable[str] = (), secret: str = ""):
+        if not secret:
+            raise ValueError("cluster mode requires a shared secret (MOCK_CLUSTER_SECRET)")
+        self.self_url = self_url.rstrip("/")
+        self.secret = secret
+        self._secret = secret.encode("latin-1")
+        self.seeds = [seed.rstrip("/") for seed in seeds if seed.rstrip("/") != self.self_url]
+        self.ring = HashRing([self.self_url])
+        self._client = None
+        # Events to each peer are sent one at a time, in registration order
+        self._event_locks: Dict[str, asyncio.Lock] = {}
+        self._tasks: Set[asyncio.Future] = set()
+
+    @classmethod
+    def from_env(cls) -> Optional["Cluster"]:
+        self_url = os.environ.get("MOCK_NODE_URL")
+        if not self_url:
+            return None
+        seeds = filter(None, os.environ.get("MOCK_CLUSTER_SEEDS", "").split(","))
+        return cls(self_url, seeds, os.environ.get("MOCK_CLUSTER_SECRET", ""))
+
+    @property
+    def client(self):
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=256, max_keepalive_connections=64),
+                timeout=10.0,
+            )
+        return self._client
+
+    def owner(self, key: str) -> str:
+        return self.ring.owner(key)
+
+    @property
+    def peer_headers(self) -> Dict[str, str]:
+        """Headers marking a request as sent by a cluster peer."""
+        return {FORWARDED_HEADER.decode(): self.secret}
+
+    def forwarded(self, scope) -> bool:
+        """Whether a request was sent by a peer holding this cluster's secret."""
+        for name, value in scope["headers"]:
+            if name == FORWARDED_HEADER:
+                return hmac.compare_digest(value, self._secret)
+        return False
+
+    def add_nodes(self, nodes: Iterable[str]) -> bool:
+        changed = False
+        for node in nodes:
+            changed |= self.ring.add(node.rstrip("/"))
+        return changed
+
+    async def join(self, tenants):
+        """Announce this node to the seeds and every node they know, then rebalance."""
+        pending = list(self.seeds)
+        contacted = set()
+        while pending:
+            node = pending.pop()
+            if node in contacted or node == self.self_url:
+                continue
+            contacted.add(node)
+            response = await self.client.post(
+                f"{node}/cluster/join", json={"url": self.self_url}, headers=self.peer_headers,
+            )
+            response.raise_for_status()
+            known = response.json()["nodes"]
+            self.add_nodes(known)
+            pending.extend(known)
+        await self.rebalance(tenants)
+
+    async def join_with_retry(self, tenants):
+        """``join`` until it succeeds, backing off between attempts and logging each failure."""
+        delay = JOIN_BACKOFF_SECONDS
+        attempt = 1
+        while True:
+            try:
+                await self.join(tenants)
+            except Exception as exc:
+                logger.warning(
+                    "joining the cluster via %s failed (attempt %d), retrying in %.1fs: %r",
+                    ", ".join(self.seeds), attempt, delay, exc,
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, JOIN_MAX_BACKOFF_SECONDS)
+                attempt += 1
+            else:
+                logger.info("joined the cluster: %s", ", ".join(sorted(self.ring.nodes)))
+                return
+
+    async def _send(self, method: str, url: str, **kwargs):
+        """Send a request to a peer, retrying with backoff."""
+        import httpx
+        for attempt in range(PUSH_ATTEMPTS):
+            try:
+                response = await self.client.request(method, url, **kwargs)
+                response.raise_for_status()
+                return
+            except httpx.HTTPError:
+                # A joining node may not be listening yet
+                if attempt == PUSH_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(PUSH_BACKOFF_SECONDS * 2 ** attempt)
+
+    async def rebalance(self, tenants):
+        """Push runtime-registered scenarios this node no longer owns to their owners."""
+        slots = asyncio.Semaphore(PUSH_CONCURRENCY)
+
+        async def push(prefix, scenario, owner):
+            async with slots:
+                await self._send(
+                    "PUT",
+                    f"{owner}{prefix}/scenarios/{scenario.kind}/{scenario.scenario_id}",
+                    content=scenario.encoded,
+                    headers={"content-type": "application/json", **self.peer_headers},
+                )
+
+        pushes = []
+        for prefix, registry in tenants.registries():
+            for scenario in registry.runtime_scenarios():
+                owner = self.owner(scenario.scenario_id)
+                if owner != self.self_url:
+                    pushes.append(push(prefix, scenario, owner))
+        await asyncio.gather(*pushes)
+
+    def publish_accumulator(self, prefix: str, scenario: Scenario):
+        """Send an accumulator registered here to the subscribers of its tenant on every peer."""
+        if scenario.kind != ACCUM:
+            return
+        event = accumulator_event(scenario)
+        for node in self.ring.nodes:
+            if node != self.self_url:
+                task = asyncio.ensure_future(self._send_event(node, prefix, event))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def share_events(self, tenants, node: str):
+        """Send a joining node the state of the runtime accumulators this node still owns."""
+        for tenant in tenants:
+            prefix = tenants.path_prefix(tenant)
+            for scenario in tenant.registry.runtime_scenarios():
+                if scenario.kind == ACCUM and self.owner(scenario.scenario_id) == self.self_url:
+                    await self._send_event(node, prefix, accumulator_event(scenario))
+
+    async def _send_event(self, node: str, prefix: str, event: Tuple[Optional[str], str, bytes]):
+        import httpx
+        topic, key, frame = event
+        async with self._event_locks.setdefault(node, asyncio.Lock()):
+            try:
+                await self._send(
+                    "POST",
+                    f"{node}{prefix}/cluster/events",
+                    json={"topic": topic, "key": key, "frame": frame.decode()},
+                    headers=self.peer_headers,
+                )
+            except httpx.HTTPError as exc:
+                logger.warning("sending accumulator %s to %s failed: %r", key, node, exc)
+
+    def router(self, tenants):
+        """Membership endpoints: ``POST /cluster/join`` and ``GET /cluster``."""
+        from fastapi import APIRouter, BackgroundTasks, Body, HTTPException, Request
+        from tenants import tenant_of
+
+        router = APIRouter(prefix="/cluster")
+
+        @router.post("/join")
+        async def join(request: Request, background: BackgroundTasks, url: str = Body(..., embed=True)):
+            """Add a node to the ring and hand it the scenarios it now owns"""
+            if not self.forwarded(request.scope):
+                raise HTTPException(status_code=403, detail="joining requires the cluster secret")
+            if self.add_nodes([url]):
+                background.add_task(self.rebalance, tenants)
+                background.add_task(self.share_events, tenants, url.rstrip("/"))
+            return {"nodes": sorted(self.ring.nodes)}
+
+        @router.post("/events")
+        async def events(
+            request: Request,
+            key: str = Body(...),
+            frame: str = Body(...),
+            topic: Optional[str] = Body(None),
+        ):
+            """Accumulator change registered on a peer, for this node's subscribers"""
+            if not self.forwarded(request.scope):
+                raise HTTPException(status_code=403, detail="events require the cluster secret")
+            tenant = tenant_of(request)
+            # Load the fixtures first so they cannot later overwrite this newer state
+            tenant.registry.load()
+            tenant.events.publish(topic, key, frame.encode())
+            return {"key": key}
+
+        @router.get("")
+        async def members():
+            """Nodes on the ring as seen by this node"""
+            return {"self": self.self_url, "nodes": sorted(self.ring.nodes)}
+
+        return router
+
+    def lifespan(self, tenants):
+        @asynccontextmanager
+        async def lifespan(app):
+            # Join once the server is accepting, so peers can push scenarios straight away
+            joining = asyncio.ensure_future(self.join_with_retry(tenants)) if self.seeds else None
+            yield
+            if joining is not None and not joining.done():
+                joining.cancel()
+            for task in list(self._tasks):
+                task.cancel()
+            if self._client is not None:
+                await self._client.aclose()
+        return lifespan
+
+
+class ClusterMiddleware:
+    """ASGI middleware forwarding sharded requests to the owning node."""
+
+    def __init__(self, app, cluster: Cluster):
+        self.app = app
+        self.cluster = cluster
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        match = _SHARDED_PATHS.match(scope["path"])
+        if match is None or self.cluster.forwarded(scope):
+            await self.app(scope, receive, send)
+            return
+        owner = self.cluster.owner(match.group(1))
+        if owner == self.cluster.self_url:
+            await self.app(scope, receive, send)
+            return
+        await self._forward(owner, scope, receive, send)
+
+    async def _forward(self, owner: str, scope, receive, send):
+        import httpx
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+        headers: Dict[str, str] = {
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in scope["headers"]
+            if name not in _DROPPED_HEADERS
+        }
+        headers.update(self.cluster.peer_headers)
+        url = owner + scope.get("raw_path", scope["path"].encode()).decode("latin-1")
+        if scope.get("query_string"):
+            url += "?" + scope["query_string"].decode("latin-1")
+        try:
+            response = await self.cluster.client.request(scope["method"], url, headers=headers, content=body)
+        except httpx.HTTPError:
+            status, response_headers, content = 502, [(b"content-type", b"application/json")], \
+                b'{"detail":"owner node unavailable"}'
+        else:
+            status, content = response.status_code, response.content
+            response_headers = [
+                (name, value) for name, value in response.headers.raw if name.lower() not in _DROPPED_HEADERS
+            ]
+        response_headers.append((b"content-length", str(len(content)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": response_headers})
+        await send({"type": "http.response.body", "body": content})
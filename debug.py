@@ -0,0 +1,79 @@
+"""Debug endpoints for sizing and diagnosing the mock under load."""
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+
+from memory import memory_report
+from profiler import ProfilerBusy, collapsed, sample
+from tenants import tenant_of
+
+router = APIRouter(prefix="/debug")
+
+
+@router.get("/cache")
+async def cache_stats(request: Request):
+    """Hit, miss and eviction counters of the tenant's encoded response cache"""
+    return tenant_of(request).response_cache.stats()
+
+
+@router.get("/memory")
+async def memory_usage(request: Request, top: int = 20):
+    """Retained bytes per scenario, cache and index of the tenant"""
+    # Walking a large catalog takes a while; keep it off the event loop
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, memory_report, tenant_of(request), top)
+
+
+@router.get("/tenants")
+async def tenant_stats(request: Request):
+    """Scenario count, scenario bytes and cache counters of every tenant"""
+    return [tenant.stats() for tenant in request.app.state.tenants]
+
+
+@router.post("/memory/snapshots/{name}")
+async def take_snapshot(name: str, request: Request, frames: int = Query(1, ge=1, le=65535)):
+    """Take a named tracemalloc snapshot, starting tracing on first use"""
+    return request.app.state.snapshots.take(name, frames)
+
+
+@router.get("/memory/snapshots/{name}")
+async def snapshot_top(name: str, request: Request, limit: int = 20, groupBy: str = "lineno"):
+    """Largest allocation sites in a snapshot"""
+    try:
+        return request.app.state.snapshots.top(name, limit, groupBy)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"no snapshot named {name!r}")
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/memory/diff")
+async def snapshot_diff(before: str, after: str, request: Request, limit: int = 20, groupBy: str = "lineno"):
+    """Allocation growth between two snapshots, largest first"""
+    try:
+        return request.app.state.snapshots.diff(before, after, limit, groupBy)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=f"no snapshot named {exc.args[0]!r}")
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.delete("/memory/snapshots")
+async def stop_snapshots(request: Request):
+    """Drop all snapshots and stop tracemalloc"""
+    request.app.state.snapshots.stop()
+    return {"tracing": False}
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(seconds: float = 5.0, interval: float = 0.005):
+    """Sample every thread for N seconds and return collapsed stacks for flamegraph tools"""
+    loop = asyncio.get_running_loop()
+    try:
+        stacks = await loop.run_in_executor(None, sample, seconds, interval)
+    except ProfilerBusy as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return collapsed(stacks)
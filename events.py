@@ -0,0 +1,103 @@
+"""Server-sent events for accumulator changes.
+
+Whenever an accumulator scenario is registered or replaced, one SSE frame is
+encoded and handed to every subscriber of that scenario's ``subscriberId``.
+Publishing never awaits: it stores the frame in each subscriber's pending
+slot and sets its wake-up event, so fan-out costs one dict write per
+subscriber. Pending frames are keyed by scenario ID, so a slow consumer just
+receives the latest state of each accumulator instead of a growing backlog.
+In cluster mode the node registering an accumulator also sends its frame to
+every peer, so a subscriber can connect to any node.
+"""
+import asyncio
+from typing import AsyncIterator, Dict, Optional, Set, Tuple
+
+from scenarios import ACCUM, DEFAULT_MODELS, Scenario, encode
+
+KEEPALIVE_SECONDS = 15.0
+
+
+def accumulator_event(scenario: Scenario) -> Tuple[Optional[str], str, bytes]:
+    """(topic, key, SSE frame) announcing the state of an accumulator scenario."""
+    member = scenario.payload.get("member") if scenario.model == DEFAULT_MODELS[ACCUM] else None
+    topic = member.get("subscriberId") if isinstance(member, dict) else None
+    frame = b"".join((
+        b"event: accumulator\nid: ", scenario.scenario_id.encode(),
+        b'\ndata: {"scenarioId":', encode(scenario.scenario_id),
+        b',"accums":', scenario.encoded, b"}\n\n",
+    ))
+    return topic, scenario.scenario_id, frame
+
+
+class Subscription:
+    __slots__ = ("pending", "wakeup")
+
+    def __init__(self):
+        self.pending: Dict[str, bytes] = {}
+        self.wakeup = asyncio.Event()
+
+    def offer(self, key: str, frame: bytes):
+        self.pending[key] = frame
+        self.wakeup.set()
+
+    def drain(self) -> bytes:
+        frames = b"".join(self.pending.values())
+        self.pending.clear()
+        self.wakeup.clear()
+        return frames
+
+
+class Broadcaster:
+    """Topic-based fan-out of pre-encoded SSE frames."""
+
+    def __init__(self):
+        self.topics: Dict[str, Set[Subscription]] = {}
+        # Latest frame per topic and key, replayed to new subscribers
+        self.latest: Dict[str, Dict[str, bytes]] = {}
+        self._topic_of: Dict[str, str] = {}
+
+    def subscribe(self, topic: str) -> Subscription:
+        subscription = Subscription()
+        for key, frame in self.latest.get(topic, {}).items():
+            subscription.offer(key, frame)
+        self.topics.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, topic: str, subscription: Subscription):
+        subscribers = self.topics.get(topic)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self.topics[topic]
+
+    def publish(self, topic: Optional[str], key: str, frame: bytes):
+        previous = self._topic_of.get(key)
+        if previous is not None and previous != topic:
+            self.latest.get(previous, {}).pop(key, None)
+        if topic is None:
+            self._topic_of.pop(key, None)
+            return
+        self._topic_of[key] = topic
+        self.latest.setdefault(topic, {})[key] = frame
+        for subscription in self.topics.get(topic, ()):
+            subscription.offer(key, frame)
+
+    def publish_accumulator(self, scenario: Scenario):
+        """Registry listener: push the new state of an accumulator scenario."""
+        if scenario.kind == ACCUM:
+            self.publish(*accumulator_event(scenario))
+
+    async def stream(self, topic: str) -> AsyncIterator[bytes]:
+        """SSE body for one subscriber: current state first, then every change."""
+        subscription = self.subscribe(topic)
+        try:
+            while True:
+                if not subscription.pending:
+                    try:
+                        await asyncio.wait_for(subscription.wakeup.wait(), KEEPALIVE_SECONDS)
+                    except asyncio.TimeoutError:
+                        yield b": keepalive\n\n"
+                        continue
+                yield subscription.drain()
+        finally:
+            self.unsubscribe(topic, subscription)
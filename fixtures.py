@@ -0,0 +1,278 @@
+"""Canned payloads served by the mock endpoints.
+
+Variants are written as overlays of the payload they differ from, so they
+share every untouched subtree with it.
+"""
+from overlays import REMOVE, overlay
+
+# Member responses
+MEMBER_RESPONSE_MA = {
+    "members": [
+        {
+            "subscriberID": "1234567890000",
+            "memberId": "00",
+            "socialSecurityID": "12345678",
+            "accountNumber": "7634526",
+            "masterRecordID": "123qwerty",
+            "personNumberExtID": "1234567890000TAN",
+            "groupNumber": "7634526",
+            "memberEffective": {
+                "startDate": "2025-08-15",
+                "endDate": "3000-12-31",
+                "originalEffectiveDate": "2025-08-15"
+            },
+            "active": True,
+            "name": {
+                "memberName": {
+                    "fullName": "TEST USER",
+                    "lastName": "USER",
+                    "firstName": "TEST"
+                },
+                "normalizedName": {
+                    "normalizedLastName": "USER",
+                    "normalizedFirstName": "TEST"
+                }
+            },
+            "telecom": [
+                {
+                    "phoneType": "G",
+                    "phoneNumber1": "0000000000",
+                    "phoneNumber2": "0000000000",
+                    "phoneRank": "1"
+                }
+            ],
+            "email": [
+                {
+                    "email": "TEST@YOPMAIL.com",
+                    "emailRank": "1",
+                    "emailSourceIndicator": "TEST_SITE",
+                    "currentEmailIndicator": "Y"
+                }
+            ],
+            "gender": "female",
+            "birthDate": "09-09-26",
+            "deceasedDateTime": "9999-12-31",
+            "address": [
+                {
+                    "use": "home",
+                    "type": "G",
+                    "addressline1": "KOLKATA",
+                    "city": "KOLKATA",
+                    "district": "090",
+                    "state": "WB",
+                    "postalCode": "7000001",
+                    "period": {
+                        "start": "1900-01-01",
+                        "end": "9999-12-31"
+                    }
+                }
+            ],
+            "multipleBirthInteger": 0,
+            "medicarePartAandBEffectiveDate": "1900-01-01",
+            "hospiceIndicator": False,
+            "ESRDIndicator": False,
+            "directPayIndicator": False,
+            "sex": "F",
+            "medicareDetail": [
+                {
+                    "coveragePeriod": {
+                        "start": "2025-08-15",
+                        "end": "3000-12-31"
+                    },
+                    "eligibilityRelationship": {
+                        "memberStatus": "10",
+                        "memberStatusDescription": "ACTIVE MEMBER"
+                    },
+                    "typeOfContract": "101",
+                    "typeOfContractDisplay": "Member only"
+                }
+            ]
+        }
+    ]
+}
+
+MEMBER_RESPONSE_MBMN = overlay(MEMBER_RESPONSE_MA, {"members/0/masterRecordID": REMOVE})
+
+MEMBER_RESPONSE_MNAC = overlay(MEMBER_RESPONSE_MA, {"members/0/memberEffective/endDate": "2025-09-04"})
+
+# Coverage responses
+_COVERAGE_RECORD = {
+    "businessIdentifier": {
+        "subscriberID": "123456789",
+        "masterRecordID": "qwerty123",
+        "personNumberExtID": "123456789JOE",
+        "socialSecurityID": "qwerty321"
+    },
+    "status": "active",
+    "type": {
+        "code": "M",
+        "display": "Medical"
+    },
+    "groupNumber": "1111111",
+    "grpBillingNumber": "0000",
+    "originalEffectiveDate": "2025-08-25",
+    "prefixSubscriberID": "ABC123456789",
+    "planPrefix": "HHV",
+    "dependent": "10",
+    "relationship": {
+        "code": "10",
+        "display": "Dependent"
+    },
+    "eligibilityRelationship": {
+        "code": "45",
+        "display": "Dependent Child"
+    },
+    "coveragePeriod": {
+        "start": "2025-08-25",
+        "end": "3000-12-31"
+    },
+    "marketSegmentCode": "Commercial",
+    "productLevel": [
+        {
+            "lineOfBusiness": {
+                "code": "A1",
+                "display": "Medical"
+            },
+            "planName": {
+                "code": "10017",
+                "display": "LIC"
+            },
+            "productCategory": {
+                "code": "3",
+                "display": "Preferred Provider Plan"
+            },
+            "coveragePackageCode": "123456",
+            "Network": {}
+        }
+    ],
+    "nascoEligibility": {}
+}
+
+COVERAGE_RESPONSE_CS = {
+    "coverages": [
+        _COVERAGE_RECORD,
+        overlay(_COVERAGE_RECORD, {"coveragePeriod": {"start": "2024-08-25", "end": "2025-08-25"}}),
+    ]
+}
+
+COVERAGE_RESPONSE_CNMID = overlay(COVERAGE_RESPONSE_CS, {"coverages/0/businessIdentifier/masterRecordID": REMOVE})
+
+COVERAGE_RESPONSE_CNAC = overlay(COVERAGE_RESPONSE_CS, {"coverages/0/coveragePeriod/end": "2025-09-04"})
+
+ERROR_RESPONSE = {"text": "error, no info found"}
+
+# Accumulator responses
+ACCUM_RESPONSE_SUCC = {
+    "member": {
+        "subscriberId": "123456789",
+        "memberSuffix": "01",
+        "firstName": "TEST",
+        "lastName": "MEMBER",
+        "gender": "female",
+        "dateOfBirth": "2089-01-06"
+    },
+    "planBenefitsAndAccums": [
+        {
+            "plan": {
+                "typeId": "127",
+                "marketingName": "TEST",
+                "planName": "TEST",
+                "type": "TEST",
+                "description": "Group, Nongroup"
+            },
+            "group": {
+                "name": "TEST INC.",
+                "id": "12345",
+                "anniversaryDate": "0101",
+                "lob": "A1"
+            },
+            "benefit": {
+                "benefitString": "1234",
+                "limitString": "4567",
+                "utilizationReviewString": "99999",
+                "benefitName": "1234"
+            },
+            "planLevelBenefitInfo": {
+                "benefitMaximums": {
+                    "benefitMaximum": [
+                        {
+                            "nascoAccumId": "12345",
+                            "network": "In/Out",
+                            "maximumType": "OutOfPocket",
+                            "amount": "6450.0",
+                            "remainingAmount": "6450.0",
+                            "unit": "TEST UNIT",
+                            "period": "TEST PERIOD",
+                            "provisionalText": "TEST"
+                        },
+                        {
+                            "nascoAccumId": "67890",
+                            "network": "In/Out",
+                            "maximumType": "OutOfPocket",
+                            "remainingAmount": "6450.0",
+                            "amount": "123.0",
+                            "unit": "TEST UNIT",
+                            "period": "TEST PERIOD",
+                            "provisionalText": "TEST"
+                        }
+                    ]
+                },
+                "memberCost": {
+                    "memberCostComponent": [
+                        {
+                            "nascoAccumId": "123456",
+                            "network": "In/Out",
+                            "costType": "Deductible",
+                            "amount": "123.0",
+                            "remainingAmount": "6450.0",
+                            "unit": "per individual TEST",
+                            "period": "TEST",
+                            "provisionalText": "TEST"
+                        },
+                        {
+                            "nascoAccumId": "05105",
+                            "network": "In/Out",
+                            "costType": "Deductible",
+                            "amount": "123.0",
+                            "remainingAmount": "6450.0",
+                            "unit": "TEST",
+                            "period": "per plan TEST",
+                            "provisionalText": "TEST"
+                        }
+                    ]
+                }
+            }
+        }
+    ]
+}
+
+_BENEFIT_MAXIMUM = "planBenefitsAndAccums/0/planLevelBenefitInfo/benefitMaximums/benefitMaximum"
+_MEMBER_COST = "planBenefitsAndAccums/0/planLevelBenefitInfo/memberCost/memberCostComponent"
+
+ACCUM_RESPONSE_REM_AMT_MISS = overlay(ACCUM_RESPONSE_SUCC, {
+    f"{_BENEFIT_MAXIMUM}/0/remainingAmount": REMOVE,
+    f"{_MEMBER_COST}/0/remainingAmount": REMOVE,
+})
+
+ACCUM_RESPONSE_F = {
+    "operationOutcome": {
+        "issue": [
+            {
+                "severity": "warning",
+                "code": "00027",
+                "details": [
+                    {
+                        "text": "NASCO error: XXXXX"
+                    }
+                ],
+                "diagnostics": "ReqID - 1234: NASCO error: TEST"
+            }
+        ]
+    },
+    **overlay(ACCUM_RESPONSE_SUCC, {
+        f"{_BENEFIT_MAXIMUM}/0/remainingAmount": REMOVE,
+        f"{_BENEFIT_MAXIMUM}/1/remainingAmount": REMOVE,
+        f"{_MEMBER_COST}/0/remainingAmount": REMOVE,
+        f"{_MEMBER_COST}/1/remainingAmount": REMOVE,
+    }),
+}
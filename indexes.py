@@ -0,0 +1,184 @@
+"""Secondary indexes over member and coverage records.
+
+Every indexed field has a hash index for exact lookups and a sorted index for
+prefix lookups. Indexes are maintained by a registry listener, so registering
+or replacing a scenario only touches that scenario's records.
+"""
+from bisect import bisect_left
+from heapq import merge
+from itertools import groupby, islice
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from scenarios import COVERAGE, DEFAULT_MODELS, MEMBER, RECORD_KEYS, Scenario, ScenarioRegistry
+
+# Query parameter name -> path to the value inside a record
+INDEXED_FIELDS = {
+    MEMBER: {
+        "subscriberID": ("subscriberID",),
+        "groupNumber": ("groupNumber",),
+        "socialSecurityID": ("socialSecurityID",),
+        "personNumberExtID": ("personNumberExtID",),
+        "accountNumber": ("accountNumber",),
+    },
+    COVERAGE: {
+        "subscriberID": ("businessIdentifier", "subscriberID"),
+        "groupNumber": ("groupNumber",),
+        "socialSecurityID": ("businessIdentifier", "socialSecurityID"),
+        "personNumberExtID": ("businessIdentifier", "personNumberExtID"),
+    },
+}
+
+# A record reference: (scenario ID, position in the scenario's record list)
+Ref = Tuple[str, int]
+
+
+def _lookup(record: Dict[str, Any], path: Tuple[str, ...]) -> Optional[str]:
+    value: Any = record
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value if isinstance(value, str) else None
+
+
+class FieldIndex:
+    """Refs per value for exact matches, plus the distinct values in order for prefixes.
+
+    Adding or removing a ref is a dict operation. A value held by one record
+    maps straight to its ref; a dict of refs is only made for shared values,
+    which keeps a large index from being millions of tiny GC-tracked dicts.
+    The ordered values are brought up to date by the first prefix query after
+    a change, in one merge.
+    """
+
+    __slots__ = ("exact", "ordered", "_added", "_stale")
+
+    def __init__(self):
+        self.exact: Dict[str, Union[Ref, Dict[Ref, None]]] = {}
+        self.ordered: List[str] = []
+        # Values indexed, and whether any were dropped, since ``ordered`` was last merged
+        self._added: Set[str] = set()
+        self._stale = False
+
+    def add(self, value: str, ref: Ref):
+        refs = self.exact.get(value)
+        if refs is None:
+            self.exact[value] = ref
+            self._added.add(value)
+        elif isinstance(refs, dict):
+            refs[ref] = None
+        elif refs != ref:
+            self.exact[value] = {refs: None, ref: None}
+
+    def remove(self, value: str, ref: Ref):
+        refs = self.exact.get(value)
+        if isinstance(refs, dict):
+            refs.pop(ref, None)
+            if len(refs) == 1:
+                self.exact[value] = next(iter(refs))
+        elif refs == ref:
+            del self.exact[value]
+            self._stale = True
+
+    def match(self, value: str) -> Collection[Ref]:
+        refs = self.exact.get(value)
+        if refs is None:
+            return ()
+        return refs if isinstance(refs, dict) else (refs,)
+
+    def values(self) -> List[str]:
+        """Distinct indexed values in order."""
+        if self._added or self._stale:
+            merged = merge(self.ordered, sorted(self._added))
+            self.ordered = [value for value, _ in groupby(merged) if value in self.exact]
+            self._added.clear()
+            self._stale = False
+        return self.ordered
+
+    def prefix(self, prefix: str) -> Iterator[Ref]:
+        values = self.values()
+        position = bisect_left(values, prefix)
+        for value in islice(values, position, None):
+            if not value.startswith(prefix):
+                break
+            yield from self.match(value)
+
+
+class RecordIndex:
+    """Indexes one kind of record (members or coverages) across all scenarios."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.fields = INDEXED_FIELDS[kind]
+        self.indexes = {name: FieldIndex() for name in self.fields}
+        self._values: Dict[Ref, Dict[str, str]] = {}
+        self._refs: Dict[str, List[Ref]] = {}
+
+    def index_scenario(self, scenario: Scenario):
+        """Registry listener: (re)index the records of one scenario."""
+        if scenario.kind != self.kind:
+            return
+        for ref in self._refs.pop(scenario.scenario_id, ()):
+            for name, value in self._values.pop(ref).items():
+                self.indexes[name].remove(value, ref)
+        if scenario.model != DEFAULT_MODELS[self.kind]:
+            return
+        refs = []
+        for position, record in enumerate(scenario.payload[RECORD_KEYS[self.kind]]):
+            ref = (scenario.scenario_id, position)
+            values = {}
+            for name, path in self.fields.items():
+                value = _lookup(record, path)
+                if value is not None:
+                    values[name] = value
+                    self.indexes[name].add(value, ref)
+            self._values[ref] = values
+            refs.append(ref)
+        self._refs[scenario.scenario_id] = refs
+
+    def search(self, criteria: Dict[str, str], limit: int) -> List[Ref]:
+        """Refs matching every criterion; a value ending in ``*`` is a prefix match.
+
+        Candidates come from the most selective exact criterion (or the first
+        prefix scan); the remaining criteria are checked per candidate.
+        """
+        exact = {name: value for name, value in criteria.items() if not value.endswith("*")}
+        prefixes = {name: value[:-1] for name, value in criteria.items() if value.endswith("*")}
+        if exact:
+            driver = min(exact, key=lambda name: len(self.indexes[name].match(exact[name])))
+            candidates: Iterable[Ref] = self.indexes[driver].match(exact.pop(driver))
+        else:
+            driver = next(iter(prefixes))
+            candidates = self.indexes[driver].prefix(prefixes.pop(driver))
+
+        found = []
+        for ref in candidates:
+            if self._matches(ref, exact, prefixes):
+                found.append(ref)
+                if len(found) >= limit:
+                    break
+        return found
+
+    def matches(self, ref: Ref, criteria: Dict[str, str]) -> bool:
+        """Whether the record behind ``ref`` satisfies every criterion."""
+        exact = {name: value for name, value in criteria.items() if not value.endswith("*")}
+        prefixes = {name: value[:-1] for name, value in criteria.items() if value.endswith("*")}
+        return self._matches(ref, exact, prefixes)
+
+    def _matches(self, ref: Ref, exact: Dict[str, str], prefixes: Dict[str, str]) -> bool:
+        values = self._values.get(ref, {})
+        return all(values.get(name) == value for name, value in exact.items()) and all(
+            values.get(name, "").startswith(prefix) for name, prefix in prefixes.items()
+        )
+
+    def records(self, registry: ScenarioRegistry, refs: Iterable[Ref]) -> List[Dict[str, Any]]:
+        record_key = RECORD_KEYS[self.kind]
+        return [registry.get(self.kind, scenario_id).payload[record_key][position] for scenario_id, position in refs]
+
+
+def attach_indexes(registry: ScenarioRegistry) -> Dict[str, RecordIndex]:
+    """Create the member and coverage indexes and keep them in sync with ``registry``."""
+    indexes = {kind: RecordIndex(kind) for kind in INDEXED_FIELDS}
+    for index in indexes.values():
+        registry.add_listener(index.index_scenario)
+    return indexes
@@ -0,0 +1,152 @@
+"""As-of-date filtering backed by a static interval tree.
+
+Periods are closed ``[start, end]`` ranges of ISO ``YYYY-MM-DD`` strings,
+which order correctly as plain strings. A period whose ends are not both
+strings, or whose end precedes its start, is never active. A scenario's
+index is built when the scenario is registered and kept for its lifetime; a
+stabbing query costs O(log n + k).
+"""
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from scenarios import COVERAGE, DEFAULT_MODELS, MEMBER, RECORD_KEYS, Scenario
+
+# (start, end, reference) where reference identifies the owning record
+Interval = Tuple[str, str, Any]
+
+
+class IntervalTree:
+    """Centered interval tree answering "which intervals contain this point"."""
+
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, intervals: Sequence[Interval]):
+        endpoints = sorted(point for start, end, _ in intervals for point in (start, end))
+        self.center = endpoints[len(endpoints) // 2] if endpoints else ""
+        here, left, right = [], [], []
+        for interval in intervals:
+            if interval[1] < self.center:
+                left.append(interval)
+            elif interval[0] > self.center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        self.by_start = sorted(here, key=lambda interval: interval[0])
+        self.by_end = sorted(here, key=lambda interval: interval[1], reverse=True)
+        self.left = IntervalTree(left) if left else None
+        self.right = IntervalTree(right) if right else None
+
+    def stab(self, point: str) -> List[Any]:
+        """References of every interval with ``start <= point <= end``."""
+        found = []
+        node: Optional[IntervalTree] = self
+        while node is not None:
+            if point < node.center:
+                for start, _, reference in node.by_start:
+                    if start > point:
+                        break
+                    found.append(reference)
+                node = node.left
+            elif point > node.center:
+                for _, end, reference in node.by_end:
+                    if end < point:
+                        break
+                    found.append(reference)
+                node = node.right
+            else:
+                found.extend(reference for _, _, reference in node.by_start)
+                break
+        return found
+
+
+def _period(period: Any, start_key: str, end_key: str) -> Optional[Tuple[str, str]]:
+    if not isinstance(period, dict):
+        return None
+    start, end = period.get(start_key), period.get(end_key)
+    if isinstance(start, str) and isinstance(end, str) and start and start <= end:
+        return start, end
+    return None
+
+
+def _details(member: Dict[str, Any]) -> List[Any]:
+    details = member.get("medicareDetail")
+    return details if isinstance(details, list) else []
+
+
+def _intervals(scenario: Scenario) -> Dict[str, List[Interval]]:
+    records = scenario.payload[RECORD_KEYS[scenario.kind]]
+    if scenario.kind == COVERAGE:
+        periods = []
+        for index, coverage in enumerate(records):
+            period = _period(coverage.get("coveragePeriod"), "start", "end")
+            if period:
+                periods.append(period + (index,))
+        return {"coverages": periods}
+
+    members, details = [], []
+    for index, member in enumerate(records):
+        period = _period(member.get("memberEffective"), "startDate", "endDate")
+        if period:
+            members.append(period + (index,))
+        for detail_index, detail in enumerate(_details(member)):
+            if not isinstance(detail, dict):
+                continue
+            period = _period(detail.get("coveragePeriod"), "start", "end")
+            if period:
+                details.append(period + ((index, detail_index),))
+    return {"members": members, "medicareDetail": details}
+
+
+def build_index(scenario: Scenario) -> Optional[Dict[str, IntervalTree]]:
+    if scenario.kind not in (MEMBER, COVERAGE) or scenario.model != DEFAULT_MODELS[scenario.kind]:
+        return None
+    return {name: IntervalTree(intervals) for name, intervals in _intervals(scenario).items()}
+
+
+def index_scenario(scenario: Scenario):
+    """Registry listener: build the period index as soon as a scenario is registered."""
+    scenario.pinned("periods", lambda: build_index(scenario))
+
+
+def parse_as_of(value: str) -> str:
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise ValueError("asOf must be a date in YYYY-MM-DD format")
+
+
+def _filter(scenario: Scenario, as_of: str) -> Dict[str, Any]:
+    index = scenario.pinned("periods", lambda: build_index(scenario))
+    if index is None:
+        return scenario.payload
+    record_key = RECORD_KEYS[scenario.kind]
+    records = scenario.payload[record_key]
+    if scenario.kind == COVERAGE:
+        active = sorted(index["coverages"].stab(as_of))
+        return {**scenario.payload, record_key: [records[i] for i in active]}
+
+    active_details: Dict[int, List[int]] = {}
+    for member_index, detail_index in index["medicareDetail"].stab(as_of):
+        active_details.setdefault(member_index, []).append(detail_index)
+    members = []
+    for index_ in sorted(index["members"].stab(as_of)):
+        member = records[index_]
+        if isinstance(member.get("medicareDetail"), list):
+            details = member["medicareDetail"]
+            member = {**member, "medicareDetail": [details[i] for i in sorted(active_details.get(index_, ()))]}
+        members.append(member)
+    return {**scenario.payload, record_key: members}
+
+
+def as_of_scenario(scenario: Scenario, as_of: str) -> Scenario:
+    """A view of ``scenario`` holding only the records active on ``as_of``.
+
+    The view is itself a Scenario, so projection and pagination apply to it
+    unchanged and cache their own variants on it.
+    """
+    as_of = parse_as_of(as_of)
+    return scenario.derived(
+        ("asOf", as_of),
+        lambda: Scenario(scenario.kind, scenario.scenario_id, _filter(scenario, as_of),
+                         scenario.model, scenario.description, scenario.revision, scenario.encoder),
+    )
@@ -1,968 +1,266 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, Any, List, Optional
-from pydantic import BaseModel
-import uvicorn
-
-app = FastAPI(
-    title="Healthcare Mock API Service",
-    version="1.0.0",
-    description="Mock API service for healthcare endpoints"
-)
-
-# Enable CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Response Models
-class MemberResponse(BaseModel):
-    members: List[Dict[str, Any]]
-
-class CoverageResponse(BaseModel):
-    coverages: List[Dict[str, Any]]
-
-class AccumulatorResponse(BaseModel):
-    member: Dict[str, Any]
-    planBenefitsAndAccums: List[Dict[str, Any]]
-
-class ErrorResponse(BaseModel):
-    text: str
-
-class OperationOutcome(BaseModel):
-    issue: List[Dict[str, Any]]
-
-class FailedAccumulatorResponse(BaseModel):
-    operationOutcome: OperationOutcome
-    member: Dict[str, Any]
-    planBenefitsAndAccums: List[Dict[str, Any]]
-
-@app.get("/")
-async def root():
-    """Root endpoint with API information"""
-    return {
-        "message": "Healthcare Mock API Service",
-        "version": "1.0.0",
-        "endpoints": [
-            {"path": "/searchMemberById/m-a", "methods": ["GET"], "description": "Search for member with ID 'm-a'"},
-            {"path": "/searchMemberById/m-b-m-n", "methods": ["GET"], "description": "Search for member with ID 'm-b-m-n'"},
-            {"path": "/searchMemberById/m-n-a-c", "methods": ["GET"], "description": "Search for member with ID 'm-n-a-c'"},
-            {"path": "/searchMemberById/m-e-r", "methods": ["GET"], "description": "Error response for member search"},
-            {"path": "/searchCoverageById/c-s", "methods": ["GET"], "description": "Search for coverage with ID 'c-s'"},
-            {"path": "/searchCoverageById/c-n-m-id", "methods": ["GET"], "description": "Search for coverage with ID 'c-n-m-id'"},
-            {"path": "/searchCoverageById/c-n-a-c", "methods": ["GET"], "description": "Search for coverage with ID 'c-n-a-c'"},
-            {"path": "/searchCoverageById/c-e-r", "methods": ["GET"], "description": "Error response for coverage search"},
-            {"path": "/searchAccums/acc-succ", "methods": ["GET"], "description": "Search for accumulator with ID 'acc-succ'"},
-            {"path": "/searchAccums/acc-rem-amt-miss", "methods": ["GET"], "description": "Search for accumulator with ID 'acc-rem-amt-miss'"},
-            {"path": "/searchAccums/acc-f", "methods": ["GET"], "description": "Search for accumulator with ID 'acc-f' (failure case)"}
-        ]
-    }
-
-# Member Search Endpoints
-
-# Response data
-MEMBER_RESPONSE_MA = {
-    "members": [
-        {
-            "subscriberID": "1234567890000",
-            "memberId": "00",
-            "socialSecurityID": "12345678",
-            "accountNumber": "7634526",
-            "masterRecordID": "123qwerty",
-            "personNumberExtID": "1234567890000TAN",
-            "groupNumber": "7634526",
-            "memberEffective": {
-                "startDate": "2025-08-15",
-                "endDate": "3000-12-31",
-                "originalEffectiveDate": "2025-08-15"
-            },
-            "active": True,
-            "name": {
-                "memberName": {
-                    "fullName": "TEST USER",
-                    "lastName": "USER",
-                    "firstName": "TEST"
-                },
-                "normalizedName": {
-                    "normalizedLastName": "USER",
-                    "normalizedFirstName": "TEST"
-                }
-            },
-            "telecom": [
-                {
-                    "phoneType": "G",
-                    "phoneNumber1": "0000000000",
-                    "phoneNumber2": "0000000000",
-                    "phoneRank": "1"
-                }
-            ],
-            "email": [
-                {
-                    "email": "TEST@YOPMAIL.com",
-                    "emailRank": "1",
-                    "emailSourceIndicator": "TEST_SITE",
-                    "currentEmailIndicator": "Y"
-                }
-            ],
-            "gender": "female",
-            "birthDate": "09-09-26",
-            "deceasedDateTime": "9999-12-31",
-            "address": [
-                {
-                    "use": "home",
-                    "type": "G",
-                    "addressline1": "KOLKATA",
-                    "city": "KOLKATA",
-                    "district": "090",
-                    "state": "WB",
-                    "postalCode": "7000001",
-                    "period": {
-                        "start": "1900-01-01",
-                        "end": "9999-12-31"
-                    }
-                }
-            ],
-            "multipleBirthInteger": 0,
-            "medicarePartAandBEffectiveDate": "1900-01-01",
-            "hospiceIndicator": False,
-            "ESRDIndicator": False,
-            "directPayIndicator": False,
-            "sex": "F",
-            "medicareDetail": [
-                {
-                    "coveragePeriod": {
-                        "start": "2025-08-15",
-                        "end": "3000-12-31"
-                    },
-                    "eligibilityRelationship": {
-                        "memberStatus": "10",
-                        "memberStatusDescription": "ACTIVE MEMBER"
-                    },
-                    "typeOfContract": "101",
-                    "typeOfContractDisplay": "Member only"
-                }
-            ]
-        }
-    ]
-}
-
-MEMBER_RESPONSE_MBMN = {
-    "members": [
-        {
-            "subscriberID": "1234567890000",
-            "memberId": "00",
-            "socialSecurityID": "12345678",
-            "accountNumber": "7634526",
-            "personNumberExtID": "1234567890000TAN",
-            "groupNumber": "7634526",
-            "memberEffective": {
-                "startDate": "2025-08-15",
-                "endDate": "3000-12-31",
-                "originalEffectiveDate": "2025-08-15"
-            },
-            "active": True,
-            "name": {
-                "memberName": {
-                    "fullName": "TEST USER",
-                    "lastName": "USER",
-                    "firstName": "TEST"
-                },
-                "normalizedName": {
-                    "normalizedLastName": "USER",
-                    "normalizedFirstName": "TEST"
-                }
-            },
-            "telecom": [
-                {
-                    "phoneType": "G",
-                    "phoneNumber1": "0000000000",
-                    "phoneNumber2": "0000000000",
-                    "phoneRank": "1"
-                }
-            ],
-            "email": [
-                {
-                    "email": "TEST@YOPMAIL.com",
-                    "emailRank": "1",
-                    "emailSourceIndicator": "TEST_SITE",
-                    "currentEmailIndicator": "Y"
-                }
-            ],
-            "gender": "female",
-            "birthDate": "09-09-26",
-            "deceasedDateTime": "9999-12-31",
-            "address": [
-                {
-                    "use": "home",
-                    "type": "G",
-                    "addressline1": "KOLKATA",
-                    "city": "KOLKATA",
-                    "district": "090",
-                    "state": "WB",
-                    "postalCode": "7000001",
-                    "period": {
-                        "start": "1900-01-01",
-                        "end": "9999-12-31"
-                    }
-                }
-            ],
-            "multipleBirthInteger": 0,
-            "medicarePartAandBEffectiveDate": "1900-01-01",
-            "hospiceIndicator": False,
-            "ESRDIndicator": False,
-            "directPayIndicator": False,
-            "sex": "F",
-            "medicareDetail": [
-                {
-                    "coveragePeriod": {
-                        "start": "2025-08-15",
-                        "end": "3000-12-31"
-                    },
-                    "eligibilityRelationship": {
-                        "memberStatus": "10",
-                        "memberStatusDescription": "ACTIVE MEMBER"
-                    },
-                    "typeOfContract": "101",
-                    "typeOfContractDisplay": "Member only"
-                }
-            ]
-        }
-    ]
-}
-
-MEMBER_RESPONSE_MNAC = {
-    "members": [
-        {
-            "subscriberID": "1234567890000",
-            "memberId": "00",
-            "socialSecurityID": "12345678",
-            "accountNumber": "7634526",
-            "masterRecordID": "123qwerty",
-            "personNumberExtID": "1234567890000TAN",
-            "groupNumber": "7634526",
-            "memberEffective": {
-                "startDate": "2025-08-15",
-                "endDate": "2025-09-04",
-                "originalEffectiveDate": "2025-08-15"
-            },
-            "active": True,
-            "name": {
-                "memberName": {
-                    "fullName": "TEST USER",
-                    "lastName": "USER",
-                    "firstName": "TEST"
-                },
-                "normalizedName": {
-                    "normalizedLastName": "USER",
-                    "normalizedFirstName": "TEST"
-                }
-            },
-            "telecom": [
-                {
-                    "phoneType": "G",
-                    "phoneNumber1": "0000000000",
-                    "phoneNumber2": "0000000000",
-                    "phoneRank": "1"
-                }
-            ],
-            "email": [
-                {
-                    "email": "TEST@YOPMAIL.com",
-                    "emailRank": "1",
-                    "emailSourceIndicator": "TEST_SITE",
-                    "currentEmailIndicator": "Y"
-                }
-            ],
-            "gender": "female",
-            "birthDate": "09-09-26",
-            "deceasedDateTime": "9999-12-31",
-            "address": [
-                {
-                    "use": "home",
-                    "type": "G",
-                    "addressline1": "KOLKATA",
-                    "city": "KOLKATA",
-                    "district": "090",
-                    "state": "WB",
-                    "postalCode": "7000001",
-                    "period": {
-                        "start": "1900-01-01",
-                        "end": "9999-12-31"
-                    }
-                }
-            ],
-            "multipleBirthInteger": 0,
-            "medicarePartAandBEffectiveDate": "1900-01-01",
-            "hospiceIndicator": False,
-            "ESRDIndicator": False,
-            "directPayIndicator": False,
-            "sex": "F",
-            "medicareDetail": [
-                {
-                    "coveragePeriod": {
-                        "start": "2025-08-15",
-                        "end": "3000-12-31"
-                    },
-                    "eligibilityRelationship": {
-                        "memberStatus": "10",
-                        "memberStatusDescription": "ACTIVE MEMBER"
-                    },
-                    "typeOfContract": "101",
-                    "typeOfContractDisplay": "Member only"
-                }
-            ]
-        }
-    ]
-}
-
-# Coverage Search Endpoints
-
-# Response data
-COVERAGE_RESPONSE_CS = {
-    "coverages": [
-        {
-            "businessIdentifier": {
-                "subscriberID": "123456789",
-                "masterRecordID": "qwerty123",
-                "personNumberExtID": "123456789JOE",
-                "socialSecurityID": "qwerty321"
-            },
-            "status": "active",
-            "type": {
-                "code": "M",
-                "display": "Medical"
-            },
-            "groupNumber": "1111111",
-            "grpBillingNumber": "0000",
-            "originalEffectiveDate": "2025-08-25",
-            "prefixSubscriberID": "ABC123456789",
-            "planPrefix": "HHV",
-            "dependent": "10",
-            "relationship": {
-                "code": "10",
-                "display": "Dependent"
-            },
-            "eligibilityRelationship": {
-                "code": "45",
-                "display": "Dependent Child"
-            },
-            "coveragePeriod": {
-                "start": "2025-08-25",
-                "end": "3000-12-31"
-            },
-            "marketSegmentCode": "Commercial",
-            "productLevel": [
-                {
-                    "lineOfBusiness": {
-                        "code": "A1",
-                        "display": "Medical"
-                    },
-                    "planName": {
-                        "code": "10017",
-                        "display": "LIC"
-                    },
-                    "productCategory": {
-                        "code": "3",
-                        "display": "Preferred Provider Plan"
-                    },
-                    "coveragePackageCode": "123456",
-                    "Network": {}
-                }
-            ],
-            "nascoEligibility": {}
-        },
-        {
-            "businessIdentifier": {
-                "subscriberID": "123456789",
-                "masterRecordID": "qwerty123",
-                "personNumberExtID": "123456789JOE",
-                "socialSecurityID": "qwerty321"
-            },
-            "status": "active",
-            "type": {
-                "code": "M",
-                "display": "Medical"
-            },
-            "groupNumber": "1111111",
-            "grpBillingNumber": "0000",
-            "originalEffectiveDate": "2025-08-25",
-            "prefixSubscriberID": "ABC123456789",
-            "planPrefix": "HHV",
-            "dependent": "10",
-            "relationship": {
-                "code": "10",
-                "display": "Dependent"
-            },
-            "eligibilityRelationship": {
-                "code": "45",
-                "display": "Dependent Child"
-            },
-            "coveragePeriod": {
-                "start": "2024-08-25",
-                "end": "2025-08-25"
-            },
-            "marketSegmentCode": "Commercial",
-            "productLevel": [
-                {
-                    "lineOfBusiness": {
-                        "code": "A1",
-                        "display": "Medical"
-                    },
-                    "planName": {
-                        "code": "10017",
-                        "display": "LIC"
-                    },
-                    "productCategory": {
-                        "code": "3",
-                        "display": "Preferred Provider Plan"
-                    },
-                    "coveragePackageCode": "123456",
-                    "Network": {}
-                }
-            ],
-            "nascoEligibility": {}
-        }
-    ]
-}
-
-COVERAGE_RESPONSE_CNMID = {
-    "coverages": [
-        {
-            "businessIdentifier": {
-                "subscriberID": "123456789",
-                "personNumberExtID": "123456789JOE",
-                "socialSecurityID": "qwerty321"
-            },
-            "status": "active",
-            "type": {
-                "code": "M",
-                "display": "Medical"
-            },
-            "groupNumber": "1111111",
-            "grpBillingNumber": "0000",
-            "originalEffectiveDate": "2025-08-25",
-            "prefixSubscriberID": "ABC123456789",
-            "planPrefix": "HHV",
-            "dependent": "10",
-            "relationship": {
-                "code": "10",
-                "display": "Dependent"
-            },
-            "eligibilityRelationship": {
-                "code": "45",
-                "display": "Dependent Child"
-            },
-            "coveragePeriod": {
-                "start": "2025-08-25",
-                "end": "3000-12-31"
-            },
-            "marketSegmentCode": "Commercial",
-            "productLevel": [
-                {
-                    "lineOfBusiness": {
-                        "code": "A1",
-                        "display": "Medical"
-                    },
-                    "planName": {
-                        "code": "10017",
-                        "display": "LIC"
-                    },
-                    "productCategory": {
-                        "code": "3",
-                        "display": "Preferred Provider Plan"
-                    },
-                    "coveragePackageCode": "123456",
-                    "Network": {}
-                }
-            ],
-            "nascoEligibility": {}
-        },
-        {
-            "businessIdentifier": {
-                "subscriberID": "123456789",
-                "masterRecordID": "qwerty123",
-                "personNumberExtID": "123456789JOE",
-                "socialSecurityID": "qwerty321"
-            },
-            "status": "active",
-            "type": {
-                "code": "M",
-                "display": "Medical"
-            },
-            "groupNumber": "1111111",
-            "grpBillingNumber": "0000",
-            "originalEffectiveDate": "2025-08-25",
-            "prefixSubscriberID": "ABC123456789",
-            "planPrefix": "HHV",
-            "dependent": "10",
-            "relationship": {
-                "code": "10",
-                "display": "Dependent"
-            },
-            "eligibilityRelationship": {
-                "code": "45",
-                "display": "Dependent Child"
-            },
-            "coveragePeriod": {
-                "start": "2024-08-25",
-                "end": "2025-08-25"
-            },
-            "marketSegmentCode": "Commercial",
-            "productLevel": [
-                {
-                    "lineOfBusiness": {
-                        "code": "A1",
-                        "display": "Medical"
-                    },
-                    "planName": {
-                        "code": "10017",
-                        "display": "LIC"
-                    },
-                    "productCategory": {
-                        "code": "3",
-                        "display": "Preferred Provider Plan"
-                    },
-                    "coveragePackageCode": "123456",
-                    "Network": {}
-                }
-            ],
-            "nascoEligibility": {}
+from typing import TYPE_CHECKING, Any, Dict, Optional
+from cluster import Cluster, ClusterMiddleware
+from ratelimit import RateLimitConfig, RateLimitMiddleware
+from scenarios import ACCUM, COVERAGE, DEFAULT_MODELS, MEMBER, RECORD_KEYS, ScenarioRegistry, encode
+
+if TYPE_CHECKING:
+    from tenants import TenantConfig
+
+def create_app(
+    registry: Optional[ScenarioRegistry] = None,
+    rate_limits: Optional[RateLimitConfig] = None,
+    tenant_config: Optional["TenantConfig"] = None,
+):
+    """Build the FastAPI app; scenarios load on first request"""
+    from typing import Union
+
+    from fastapi import Body, FastAPI, HTTPException, Query, Request, Response
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import StreamingResponse
+    from intervals import as_of_scenario
+    from pagination import page_body
+    from catalog import serve_cached_openapi
+    from debug import router as debug_router
+    from memory import SnapshotStore
+    from models import AccumulatorResponse, CoverageResponse, ErrorResponse, FailedAccumulatorResponse, \
+        MemberResponse
+    from projection import project, resolve_fields
+    from tenants import DEFAULT_TENANT, Tenant, TenantBudgetExceeded, TenantConfig, TenantMiddleware, Tenants, \
+        tenant_of
+
+    title, version = "Healthcare Mock API Service", "1.0.0"
+    tenant_config = tenant_config or TenantConfig.from_env()
+    default = Tenant(
+        DEFAULT_TENANT,
+        registry,
+        cache_max_bytes=tenant_config.cache_max_bytes,
+        scenario_max_bytes=tenant_config.scenario_max_bytes,
+        quota=tenant_config.quota,
+        title=title,
+        version=version,
+    )
+    tenants = Tenants(default, tenant_config, title, version)
+    cluster = Cluster.from_env()
+    app = FastAPI(
+        title=title,
+        version=version,
+        description="Mock API service for healthcare endpoints",
+        lifespan=cluster.lifespan(tenants) if cluster else None,
+    )
+    # The default tenant's state doubles as the app's own
+    app.state.tenants = tenants
+    app.state.registry = default.registry
+    app.state.indexes = default.indexes
+    app.state.name_index = default.name_index
+    app.state.response_cache = default.response_cache
+    app.state.events = default.events
+    app.state.catalog = default.catalog
+    app.state.snapshots = SnapshotStore()
+    serve_cached_openapi(app)
+
+    # Sharded mode: forward lookups to the node owning the ID (off unless configured)
+    if cluster:
+        app.add_middleware(ClusterMiddleware, cluster=cluster)
+        app.include_router(cluster.router(tenants))
+
+    # Simulated upstream rate limits (off unless configured)
+    rate_limits = rate_limits or RateLimitConfig.from_env()
+    if rate_limits:
+        app.add_middleware(RateLimitMiddleware, config=rate_limits, cluster=cluster)
+
+    # Tenant namespaces, selected by the X-Mock-Tenant header or a /t/{tenant} prefix
+    app.add_middleware(TenantMiddleware, tenants=tenants, cluster=cluster)
+
+    # Enable CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    async def scenario_response(
+        request: Request,
+        kind: str,
+        scenario_id: str,
+        fields: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        as_of: Optional[str] = None,
+    ) -> Response:
+        tenant = tenant_of(request)
+        scenario = tenant.registry.get(kind, scenario_id)
+        if scenario is None:
+            raise HTTPException(status_code=404, detail="Not Found")
+        try:
+            if as_of is not None:
+                scenario = as_of_scenario(scenario, as_of)
+            if limit is not None or cursor is not None:
+                paths, plan = resolve_fields(fields) if fields is not None else ((), None)
+                body = page_body(scenario, limit, cursor, plan, paths)
+            elif fields is not None:
+                paths, plan = resolve_fields(fields)
+                key = (kind, scenario_id, scenario.revision, as_of, paths)
+                body = await tenant.response_cache.get(key, lambda: encode(project(scenario, plan)))
+            else:
+                body = scenario.encoded
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        return Response(content=body, media_type="application/json")
+
+    @app.get("/")
+    async def root(request: Request, limit: Optional[int] = None, cursor: Optional[str] = None):
+        """Root endpoint with API information, listing scenario endpoints in pages"""
+        try:
+            body = tenant_of(request).catalog.page(limit, cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        return Response(content=body, media_type="application/json")
+
+    # Accumulator Endpoints
+    @app.get(
+        "/searchAccums/{accum_id}",
+        responses={200: {"model": Union[AccumulatorResponse, FailedAccumulatorResponse]}},
+    )
+    async def search_accums(accum_id: str, request: Request, fields: Optional[str] = None):
+        """Search for accumulator by scenario ID"""
+        return await scenario_response(request, ACCUM, accum_id, fields)
+
+    @app.get("/subscribeAccums/{subscriber_id}")
+    async def subscribe_accums(subscriber_id: str, request: Request):
+        """Stream accumulator changes for a subscriber as server-sent events"""
+        tenant = tenant_of(request)
+        tenant.registry.load()
+        return StreamingResponse(
+            tenant.events.stream(subscriber_id),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    # Coverage Search Endpoints
+    @app.get(
+        "/searchCoverageById/{coverage_id}",
+        responses={200: {"model": Union[CoverageResponse, ErrorResponse]}},
+    )
+    async def search_coverage(
+        coverage_id: str,
+        request: Request,
+        fields: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        as_of: Optional[str] = Query(None, alias="asOf"),
+    ):
+        """Search for coverage by scenario ID"""
+        return await scenario_response(request, COVERAGE, coverage_id, fields, limit, cursor, as_of)
+
+    # Member Search Endpoints
+    @app.get(
+        "/searchMemberById/{member_id}",
+        responses={200: {"model": Union[MemberResponse, ErrorResponse]}},
+    )
+    async def search_member(
+        member_id: str,
+        request: Request,
+        fields: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        as_of: Optional[str] = Query(None, alias="asOf"),
+    ):
+        """Search for member by scenario ID"""
+        return await scenario_response(request, MEMBER, member_id, fields, limit, cursor, as_of)
+
+    def record_search(
+        request: Request,
+        kind: str,
+        criteria: Dict[str, Optional[str]],
+        limit: int,
+        name: Optional[str] = None,
+    ):
+        criteria = {field: value for field, value in criteria.items() if value}
+        if not criteria and not name:
+            raise HTTPException(status_code=400, detail="at least one search field is required")
+        if not 1 <= limit <= 1000:
+            raise HTTPException(status_code=400, detail="limit must be between 1 and 1000")
+        tenant = tenant_of(request)
+        tenant.registry.load()
+        index = tenant.indexes[kind]
+        if name:
+            accept = (lambda ref: index.matches(ref, criteria)) if criteria else None
+            refs = tenant.name_index.search(name, limit, accept)
+        else:
+            refs = index.search(criteria, limit)
+        return {RECORD_KEYS[kind]: index.records(tenant.registry, refs)}
+
+    # Secondary index lookups; a value ending in '*' matches by prefix
+    @app.get("/searchMembers")
+    async def search_members(
+        request: Request,
+        subscriberID: Optional[str] = None,
+        groupNumber: Optional[str] = None,
+        socialSecurityID: Optional[str] = None,
+        personNumberExtID: Optional[str] = None,
+        accountNumber: Optional[str] = None,
+        name: Optional[str] = None,
+        limit: int = 100,
+    ):
+        """Search members across all scenarios by indexed fields, or fuzzily by name (best match first)"""
+        criteria = {
+            "subscriberID": subscriberID,
+            "groupNumber": groupNumber,
+            "socialSecurityID": socialSecurityID,
+            "personNumberExtID": personNumberExtID,
+            "accountNumber": accountNumber,
         }
-    ]
-}
-
-COVERAGE_RESPONSE_CNAC = {
-    "coverages": [
-        {
-            "businessIdentifier": {
-                "subscriberID": "123456789",
-                "masterRecordID": "qwerty123",
-                "personNumberExtID": "123456789JOE",
-                "socialSecurityID": "qwerty321"
-            },
-            "status": "active",
-            "type": {
-                "code": "M",
-                "display": "Medical"
-            },
-            "groupNumber": "1111111",
-            "grpBillingNumber": "0000",
-            "originalEffectiveDate": "2025-08-25",
-            "prefixSubscriberID": "ABC123456789",
-            "planPrefix": "HHV",
-            "dependent": "10",
-            "relationship": {
-                "code": "10",
-                "display": "Dependent"
-            },
-            "eligibilityRelationship": {
-                "code": "45",
-                "display": "Dependent Child"
-            },
-            "coveragePeriod": {
-                "start": "2025-08-25",
-                "end": "2025-09-04"
-            },
-            "marketSegmentCode": "Commercial",
-            "productLevel": [
-                {
-                    "lineOfBusiness": {
-                        "code": "A1",
-                        "display": "Medical"
-                    },
-                    "planName": {
-                        "code": "10017",
-                        "display": "LIC"
-                    },
-                    "productCategory": {
-                        "code": "3",
-                        "display": "Preferred Provider Plan"
-                    },
-                    "coveragePackageCode": "123456",
-                    "Network": {}
-                }
-            ],
-            "nascoEligibility": {}
-        },
-        {
-            "businessIdentifier": {
-                "subscriberID": "123456789",
-                "masterRecordID": "qwerty123",
-                "personNumberExtID": "123456789JOE",
-                "socialSecurityID": "qwerty321"
-            },
-            "status": "active",
-            "type": {
-                "code": "M",
-                "display": "Medical"
-            },
-            "groupNumber": "1111111",
-            "grpBillingNumber": "0000",
-            "originalEffectiveDate": "2025-08-25",
-            "prefixSubscriberID": "ABC123456789",
-            "planPrefix": "HHV",
-            "dependent": "10",
-            "relationship": {
-                "code": "10",
-                "display": "Dependent"
-            },
-            "eligibilityRelationship": {
-                "code": "45",
-                "display": "Dependent Child"
-            },
-            "coveragePeriod": {
-                "start": "2024-08-25",
-                "end": "2025-08-25"
-            },
-            "marketSegmentCode": "Commercial",
-            "productLevel": [
-                {
-                    "lineOfBusiness": {
-                        "code": "A1",
-                        "display": "Medical"
-                    },
-                    "planName": {
-                        "code": "10017",
-                        "display": "LIC"
-                    },
-                    "productCategory": {
-                        "code": "3",
-                        "display": "Preferred Provider Plan"
-                    },
-                    "coveragePackageCode": "123456",
-                    "Network": {}
-                }
-            ],
-            "nascoEligibility": {}
-        }
-    ]
-}
-
-ERROR_RESPONSE = {"text": "error, no info found"}
-
-# Accumulator Search Endpoints
-
-# Response data
-ACCUM_RESPONSE_SUCC = {
-    "member": {
-        "subscriberId": "123456789",
-        "memberSuffix": "01",
-        "firstName": "TEST",
-        "lastName": "MEMBER",
-        "gender": "female",
-        "dateOfBirth": "2089-01-06"
-    },
-    "planBenefitsAndAccums": [
-        {
-            "plan": {
-                "typeId": "127",
-                "marketingName": "TEST",
-                "planName": "TEST",
-                "type": "TEST",
-                "description": "Group, Nongroup"
-            },
-            "group": {
-                "name": "TEST INC.",
-                "id": "12345",
-                "anniversaryDate": "0101",
-                "lob": "A1"
-            },
-            "benefit": {
-                "benefitString": "1234",
-                "limitString": "4567",
-                "utilizationReviewString": "99999",
-                "benefitName": "1234"
-            },
-            "planLevelBenefitInfo": {
-                "benefitMaximums": {
-                    "benefitMaximum": [
-                        {
-                            "nascoAccumId": "12345",
-                            "network": "In/Out",
-                            "maximumType": "OutOfPocket",
-                            "amount": "6450.0",
-                            "remainingAmount": "6450.0",
-                            "unit": "TEST UNIT",
-                            "period": "TEST PERIOD",
-                            "provisionalText": "TEST"
-                        },
-                        {
-                            "nascoAccumId": "67890",
-                            "network": "In/Out",
-                            "maximumType": "OutOfPocket",
-                            "remainingAmount": "6450.0",
-                            "amount": "123.0",
-                            "unit": "TEST UNIT",
-                            "period": "TEST PERIOD",
-                            "provisionalText": "TEST"
-                        }
-                    ]
-                },
-                "memberCost": {
-                    "memberCostComponent": [
-                        {
-                            "nascoAccumId": "123456",
-                            "network": "In/Out",
-                            "costType": "Deductible",
-                            "amount": "123.0",
-                            "remainingAmount": "6450.0",
-                            "unit": "per individual TEST",
-                            "period": "TEST",
-                            "provisionalText": "TEST"
-                        },
-                        {
-                            "nascoAccumId": "05105",
-                            "network": "In/Out",
-                            "costType": "Deductible",
-                            "amount": "123.0",
-                            "remainingAmount": "6450.0",
-                            "unit": "TEST",
-                            "period": "per plan TEST",
-                            "provisionalText": "TEST"
-                        }
-                    ]
-                }
-            }
+        return record_search(request, MEMBER, criteria, limit, name)
+
+    @app.get("/searchCoverages")
+    async def search_coverages(
+        request: Request,
+        subscriberID: Optional[str] = None,
+        groupNumber: Optional[str] = None,
+        socialSecurityID: Optional[str] = None,
+        personNumberExtID: Optional[str] = None,
+        limit: int = 100,
+    ):
+        """Search coverages across all scenarios by indexed fields"""
+        criteria = {
+            "subscriberID": subscriberID,
+            "groupNumber": groupNumber,
+            "socialSecurityID": socialSecurityID,
+            "personNumberExtID": personNumberExtID,
         }
-    ]
-}
-
-ACCUM_RESPONSE_REM_AMT_MISS = {
-    "member": {
-        "subscriberId": "123456789",
-        "memberSuffix": "01",
-        "firstName": "TEST",
-        "lastName": "MEMBER",
-        "gender": "female",
-        "dateOfBirth": "2089-01-06"
-    },
-    "planBenefitsAndAccums": [
-        {
-            "plan": {
-                "typeId": "127",
-                "marketingName": "TEST",
-                "planName": "TEST",
-                "type": "TEST",
-                "description": "Group, Nongroup"
-            },
-            "group": {
-                "name": "TEST INC.",
-                "id": "12345",
-                "anniversaryDate": "0101",
-                "lob": "A1"
-            },
-            "benefit": {
-                "benefitString": "1234",
-                "limitString": "4567",
-                "utilizationReviewString": "99999",
-                "benefitName": "1234"
-            },
-            "planLevelBenefitInfo": {
-                "benefitMaximums": {
-                    "benefitMaximum": [
-                        {
-                            "nascoAccumId": "12345",
-                            "network": "In/Out",
-                            "maximumType": "OutOfPocket",
-                            "amount": "6450.0",
-                            "unit": "TEST UNIT",
-                            "period": "TEST PERIOD",
-                            "provisionalText": "TEST"
-                        },
-                        {
-                            "nascoAccumId": "67890",
-                            "network": "In/Out",
-                            "maximumType": "OutOfPocket",
-                            "remainingAmount": "6450.0",
-                            "amount": "123.0",
-                            "unit": "TEST UNIT",
-                            "period": "TEST PERIOD",
-                            "provisionalText": "TEST"
-                        }
-                    ]
-                },
-                "memberCost": {
-                    "memberCostComponent": [
-                        {
-                            "nascoAccumId": "123456",
-                            "network": "In/Out",
-                            "costType": "Deductible",
-                            "amount": "123.0",
-                            "unit": "per individual TEST",
-                            "period": "TEST",
-                            "provisionalText": "TEST"
-                        },
-                        {
-                            "nascoAccumId": "05105",
-                            "network": "In/Out",
-                            "costType": "Deductible",
-                            "amount": "123.0",
-                            "remainingAmount": "6450.0",
-                            "unit": "TEST",
-                            "period": "per plan TEST",
-                            "provisionalText": "TEST"
-                        }
-                    ]
-                }
-            }
-        }
-    ]
-}
-
-ACCUM_RESPONSE_F = {
-    "operationOutcome": {
-        "issue": [
-            {
-                "severity": "warning",
-                "code": "00027",
-                "details": [
-                    {
-                        "text": "NASCO error: XXXXX"
-                    }
-                ],
-                "diagnostics": "ReqID - 1234: NASCO error: TEST"
-            }
-        ]
-    },
-    "member": {
-        "subscriberId": "123456789",
-        "memberSuffix": "01",
-        "firstName": "TEST",
-        "lastName": "MEMBER",
-        "gender": "female",
-        "dateOfBirth": "2089-01-06"
-    },
-    "planBenefitsAndAccums": [
-        {
-            "plan": {
-                "typeId": "127",
-                "marketingName": "TEST",
-                "planName": "TEST",
-                "type": "TEST",
-                "description": "Group, Nongroup"
-            },
-            "group": {
-                "name": "TEST INC.",
-                "id": "12345",
-                "anniversaryDate": "0101",
-                "lob": "A1"
-            },
-            "benefit": {
-                "benefitString": "1234",
-                "limitString": "4567",
-                "utilizationReviewString": "99999",
-                "benefitName": "1234"
-            },
-            "planLevelBenefitInfo": {
-                "benefitMaximums": {
-                    "benefitMaximum": [
-                        {
-                            "nascoAccumId": "12345",
-                            "network": "In/Out",
-                            "maximumType": "OutOfPocket",
-                            "amount": "6450.0",
-                            "unit": "TEST UNIT",
-                            "period": "TEST PERIOD",
-                            "provisionalText": "TEST"
-                        },
-                        {
-                            "nascoAccumId": "67890",
-                            "network": "In/Out",
-                            "maximumType": "OutOfPocket",
-                            "amount": "123.0",
-                            "unit": "TEST UNIT",
-                            "period": "TEST PERIOD",
-                            "provisionalText": "TEST"
-                        }
-                    ]
-                },
-                "memberCost": {
-                    "memberCostComponent": [
-                        {
-                            "nascoAccumId": "123456",
-                            "network": "In/Out",
-                            "costType": "Deductible",
-                            "amount": "123.0",
-                            "unit": "per individual TEST",
-                            "period": "TEST",
-                            "provisionalText": "TEST"
-                        },
-                        {
-                            "nascoAccumId": "05105",
-                            "network": "In/Out",
-                            "costType": "Deductible",
-                            "amount": "123.0",
-                            "unit": "TEST",
-                            "period": "per plan TEST",
-                            "provisionalText": "TEST"
-                        }
-                    ]
-                }
-            }
-        }
-    ]
-}
-
-# Accumulator Endpoints
-@app.get("/searchAccums/acc-succ", response_model=AccumulatorResponse)
-async def search_accum_success():
-    """Search for accumulator with ID 'acc-succ'"""
-    return ACCUM_RESPONSE_SUCC
-
-@app.get("/searchAccums/acc-rem-amt-miss", response_model=AccumulatorResponse)
-async def search_accum_rem_amt_miss():
-    """Search for accumulator with ID 'acc-rem-amt-miss'"""
-    return ACCUM_RESPONSE_REM_AMT_MISS
-
-@app.get("/searchAccums/acc-f", response_model=FailedAccumulatorResponse)
-async def search_accum_failure():
-    """Search for accumulator with ID 'acc-f'"""
-    return ACCUM_RESPONSE_F
-
-# Coverage Search Endpoints
-@app.get("/searchCoverageById/c-s", response_model=CoverageResponse)
-async def search_coverage_cs():
-    """Search for coverage with ID 'c-s'"""
-    return COVERAGE_RESPONSE_CS
-
-@app.get("/searchCoverageById/c-n-m-id", response_model=CoverageResponse)
-async def search_coverage_cnmid():
-    """Search for coverage with ID 'c-n-m-id'"""
-    return COVERAGE_RESPONSE_CNMID
-
-@app.get("/searchCoverageById/c-n-a-c", response_model=CoverageResponse)
-async def search_coverage_cnac():
-    """Search for coverage with ID 'c-n-a-c'"""
-    return COVERAGE_RESPONSE_CNAC
-
-@app.get("/searchCoverageById/c-e-r", response_model=ErrorResponse)
-async def search_coverage_error():
-    """Return error for coverage search"""
-    return ERROR_RESPONSE
-
-@app.get("/searchMemberById/m-a", response_model=MemberResponse)
-async def search_member_ma():
-    """Search for member with ID 'm-a'"""
-    return MEMBER_RESPONSE_MA
-
-@app.get("/searchMemberById/m-b-m-n", response_model=MemberResponse)
-async def search_member_m_b_m_n():
-    """Search for member with ID 'm-b-m-n'"""
-    return MEMBER_RESPONSE_MBMN
-
-@app.get("/searchMemberById/m-n-a-c", response_model=MemberResponse)
-async def search_member_m_n_a_c():
-    """Search for member with ID 'm-n-a-c'"""
-    return MEMBER_RESPONSE_MNAC
-
-@app.get("/searchMemberById/m-e-r", response_model=ErrorResponse)
-async def search_member_error():
-    """Return error for member search"""
-    return ERROR_RESPONSE
+        return record_search(request, COVERAGE, criteria, limit)
+
+    # Scenario registration
+    @app.put("/scenarios/{kind}/{scenario_id}")
+    async def register_scenario(kind: str, scenario_id: str, request: Request, payload: Dict[str, Any] = Body(...)):
+        """Register or replace a scenario served by the search endpoints"""
+        if kind not in DEFAULT_MODELS:
+            raise HTTPException(status_code=404, detail=f"unknown scenario kind {kind!r}")
+        tenant = tenant_of(request)
+        try:
+            scenario = tenant.register(kind, scenario_id, payload)
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+        except TenantBudgetExceeded as exc:
+            raise HTTPException(status_code=413, detail=str(exc))
+        if cluster is not None:
+            cluster.publish_accumulator(tenants.path_prefix(tenant), scenario)
+        return {"kind": kind, "id": scenario_id}
+
+    app.include_router(debug_router)
+
+    return app
+
+def __getattr__(name):
+    # Build the app on first access so `import main` stays cheap; uvicorn's
+    # `main:app` lookup goes through here.
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
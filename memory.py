@@ -0,0 +1,154 @@
+"""Memory accounting for scenarios, caches and indexes, plus tracemalloc snapshots.
+
+Accounting walks the live structures only when a report is requested, and a
+scenario's payload size is computed once per revision, so nothing here costs
+anything between reports. Reports are built in a worker thread, so every
+dict the event loop may change is copied in one C-level call before it is
+iterated. tracemalloc is only started on demand because it
+slows every allocation while tracing.
+"""
+import sys
+import tracemalloc
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MAX_SNAPSHOTS = 10
+
+
+def deep_size(obj: Any) -> int:
+    """Bytes retained by ``obj`` and everything reachable from it, counting shared objects once."""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, "__dict__"):
+            stack.append(current.__dict__)
+        else:
+            for slot in getattr(type(current), "__slots__", ()):
+                if hasattr(current, slot):
+                    stack.append(getattr(current, slot))
+    return total
+
+
+def scenario_usage(scenario) -> Dict[str, Any]:
+    payload = scenario.pinned("payloadBytes", lambda: deep_size(scenario.payload))
+    cached = scenario.cached()
+    encoded = len(cached.pop("encoded", b""))
+    cached.pop("payloadBytes", None)
+    derived = sum(deep_size(value) for value in cached.values())
+    return {
+        "kind": scenario.kind,
+        "id": scenario.scenario_id,
+        "payloadBytes": payload,
+        "encodedBytes": encoded,
+        "derivedBytes": derived,
+        "totalBytes": payload + encoded + derived,
+    }
+
+
+def process_usage() -> Dict[str, Any]:
+    usage: Dict[str, Any] = {"tracemalloc": tracemalloc.is_tracing()}
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        usage["maxRssBytes"] = max_rss if sys.platform == "darwin" else max_rss * 1024
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        usage["tracedBytes"] = current
+        usage["tracedPeakBytes"] = peak
+    return usage
+
+
+def memory_report(state, top: int = 20) -> Dict[str, Any]:
+    """Retained bytes per scenario, cache and index of an app's state."""
+    scenarios = [scenario_usage(scenario) for scenario in state.registry.scenarios()]
+    scenarios.sort(key=lambda usage: usage["totalBytes"], reverse=True)
+    stats = state.response_cache.stats()
+    return {
+        "process": process_usage(),
+        "scenarios": {
+            "count": len(scenarios),
+            "totalBytes": sum(usage["totalBytes"] for usage in scenarios),
+            # Per-scenario sizes count shared subtrees in full; this counts them once
+            "distinctPayloadBytes": deep_size([scenario.payload for scenario in state.registry.scenarios()]),
+            "sharing": state.registry.interned.stats(),
+            "largest": scenarios[:top],
+        },
+        "caches": {
+            "response": {key: stats[key] for key in ("entries", "bytes", "maxBytes")},
+        },
+        "indexes": {
+            **{kind: deep_size(index) for kind, index in state.indexes.items()},
+            "names": deep_size(state.name_index),
+        },
+        "events": {
+            "topics": len(state.events.topics),
+            "subscribers": sum(len(subscribers) for subscribers in list(state.events.topics.values())),
+            "latestFrameBytes": deep_size(state.events.latest),
+        },
+    }
+
+
+class SnapshotStore:
+    """Named tracemalloc snapshots for before/after comparisons during a load test."""
+
+    def __init__(self):
+        self.snapshots: "OrderedDict[str, tracemalloc.Snapshot]" = OrderedDict()
+
+    def take(self, name: str, frames: int = 1) -> Dict[str, Any]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        self.snapshots.pop(name, None)
+        self.snapshots[name] = snapshot
+        while len(self.snapshots) > MAX_SNAPSHOTS:
+            self.snapshots.popitem(last=False)
+        return {"name": name, "tracedBytes": sum(stat.size for stat in snapshot.statistics("filename"))}
+
+    def top(self, name: str, limit: int = 20, group_by: str = "lineno") -> List[Dict[str, Any]]:
+        snapshot = self._get(name)
+        return [
+            {"location": str(stat.traceback), "sizeBytes": stat.size, "count": stat.count}
+            for stat in snapshot.statistics(group_by)[:limit]
+        ]
+
+    def diff(self, before: str, after: str, limit: int = 20, group_by: str = "lineno") -> List[Dict[str, Any]]:
+        stats = self._get(after).compare_to(self._get(before), group_by)
+        return [
+            {
+                "location": str(stat.traceback),
+                "sizeDiffBytes": stat.size_diff,
+                "sizeBytes": stat.size,
+                "countDiff": stat.count_diff,
+            }
+            for stat in stats[:limit]
+        ]
+
+    def stop(self):
+        """Forget all snapshots and stop tracing."""
+        self.snapshots.clear()
+        tracemalloc.stop()
+
+    def _get(self, name: str) -> "tracemalloc.Snapshot":
+        snapshot: Optional[tracemalloc.Snapshot] = self.snapshots.get(name)
+        if snapshot is None:
+            raise KeyError(name)
+        return snapshot
@@ -0,0 +1,32 @@
+"""Response models for the mock endpoints."""
+from typing import Dict, Any, List
+from pydantic import BaseModel
+
+class MemberResponse(BaseModel):
+    members: List[Dict[str, Any]]
+
+class CoverageResponse(BaseModel):
+    coverages: List[Dict[str, Any]]
+
+class AccumulatorResponse(BaseModel):
+    member: Dict[str, Any]
+    planBenefitsAndAccums: List[Dict[str, Any]]
+
+class ErrorResponse(BaseModel):
+    text: str
+
+class OperationOutcome(BaseModel):
+    issue: List[Dict[str, Any]]
+
+class FailedAccumulatorResponse(BaseModel):
+    operationOutcome: OperationOutcome
+    member: Dict[str, Any]
+    planBenefitsAndAccums: List[Dict[str, Any]]
+
+def validate(model_name: str, payload: Dict[str, Any]):
+    """Validate a payload against the named response model."""
+    model = globals()[model_name]
+    if hasattr(model, "model_validate"):
+        model.model_validate(payload)
+    else:
+        model.parse_obj(payload)
@@ -0,0 +1,132 @@
+"""Trigram index for fuzzy, ranked member name search.
+
+Names are normalized to upper-case words and split into padded trigrams
+(``"  T", " TE", "TES", "EST", "ST "``). A query scores members by trigram
+Jaccard similarity, with a bonus for names that start with the query so
+type-ahead prefixes rank first. Candidate generation walks postings from the
+rarest trigram up and stops admitting new candidates once enough are found,
+so common trigrams never cause a full scan. Only records passing the other
+search criteria are admitted, so the cap never crowds out a match.
+"""
+import heapq
+import re
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from scenarios import DEFAULT_MODELS, MEMBER, RECORD_KEYS, Scenario
+
+# Once this many candidates exist, further postings only re-score them
+MAX_CANDIDATES = 5000
+PREFIX_BONUS = 0.5
+
+Ref = Tuple[str, int]
+
+_NON_WORD = re.compile(r"[^0-9A-Z]+")
+
+
+def normalize(text: str) -> str:
+    return _NON_WORD.sub(" ", text.upper()).strip()
+
+
+def trigrams(text: str) -> Set[str]:
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _field(value: Any, key: str) -> Any:
+    return value.get(key) if isinstance(value, dict) else None
+
+
+def member_name(member: Dict[str, Any]) -> str:
+    name = member.get("name")
+    normalized = _field(name, "normalizedName")
+    parts = [_field(normalized, "normalizedFirstName"), _field(normalized, "normalizedLastName")]
+    if not any(isinstance(part, str) and part for part in parts):
+        parts = [_field(_field(name, "memberName"), "fullName")]
+    return normalize(" ".join(part for part in parts if isinstance(part, str) and part))
+
+
+class NameIndex:
+    """Inverted trigram index over member names, updated per scenario."""
+
+    def __init__(self):
+        self.postings: Dict[str, Set[int]] = {}
+        # doc ID -> (ref, normalized name, trigram count); freed slots are None
+        self.docs: List[Optional[Tuple[Ref, str, int]]] = []
+        self._free: List[int] = []
+        self._by_scenario: Dict[str, List[int]] = {}
+
+    def _add(self, ref: Ref, name: str) -> int:
+        grams = trigrams(name)
+        doc = self._free.pop() if self._free else len(self.docs)
+        if doc == len(self.docs):
+            self.docs.append(None)
+        self.docs[doc] = (ref, name, len(grams))
+        for gram in grams:
+            self.postings.setdefault(gram, set()).add(doc)
+        return doc
+
+    def _remove(self, doc: int):
+        _, name, _ = self.docs[doc]
+        for gram in trigrams(name):
+            posting = self.postings.get(gram)
+            if posting is not None:
+                posting.discard(doc)
+                if not posting:
+                    del self.postings[gram]
+        self.docs[doc] = None
+        self._free.append(doc)
+
+    def index_scenario(self, scenario: Scenario):
+        """Registry listener: (re)index the member names of one scenario."""
+        if scenario.kind != MEMBER:
+            return
+        for doc in self._by_scenario.pop(scenario.scenario_id, ()):
+            self._remove(doc)
+        if scenario.model != DEFAULT_MODELS[MEMBER]:
+            return
+        docs = []
+        for position, member in enumerate(scenario.payload[RECORD_KEYS[MEMBER]]):
+            name = member_name(member)
+            if name:
+                docs.append(self._add((scenario.scenario_id, position), name))
+        self._by_scenario[scenario.scenario_id] = docs
+
+    def search(self, query: str, limit: int, accept: Optional[Callable[[Ref], bool]] = None) -> List[Ref]:
+        """Top ``limit`` refs by similarity to ``query``, best first."""
+        query = normalize(query)
+        grams = trigrams(query)
+        if not grams:
+            return []
+        ordered = sorted(grams, key=lambda gram: len(self.postings.get(gram, ())))
+        hits: Dict[int, int] = {}
+        rejected: Set[int] = set()
+        for gram in ordered:
+            posting = self.postings.get(gram)
+            if not posting:
+                continue
+            for doc in hits:
+                if doc in posting:
+                    hits[doc] += 1
+            if len(hits) < MAX_CANDIDATES:
+                for doc in posting:
+                    if doc in hits or doc in rejected:
+                        continue
+                    if accept is not None and not accept(self.docs[doc][0]):
+                        rejected.add(doc)
+                        continue
+                    hits[doc] = 1
+                    if len(hits) >= MAX_CANDIDATES:
+                        break
+
+        def scored():
+            for doc, shared in hits.items():
+                ref, name, size = self.docs[doc]
+                score = shared / (len(grams) + size - shared)
+                if name.startswith(query):
+                    score += PREFIX_BONUS
+                yield score, -doc, ref
+
+        return [ref for _, _, ref in heapq.nlargest(limit, scored())]
@@ -0,0 +1,156 @@
+"""Structural sharing for scenario payloads.
+
+Variants are written as a base payload plus a patch of ``"a/0/b"`` paths::
+
+    overlay(MEMBER_RESPONSE_MA, {"members/0/masterRecordID": REMOVE})
+
+Only the containers along a patched path are copied; every other subtree is
+the base's own object. The registry then interns each payload, so identical
+subtrees registered separately (say, two PUTs of near-identical records)
+also become one object, and the encoded bytes of a subtree used by more than
+one parent are built once and reused when any payload containing it is
+encoded. Payloads must not be mutated once registered.
+"""
+import json
+import sys
+from typing import Any, Dict, Hashable, List, Optional, Union
+
+
+class _Remove:
+    def __repr__(self) -> str:
+        return "REMOVE"
+
+
+# Patch value deleting the key (or list item) at its path
+REMOVE = _Remove()
+
+
+def _key(node: Any, part: str) -> Union[str, int]:
+    return int(part) if isinstance(node, list) else part
+
+
+def _patched(node: Any, parts: List[str], value: Any) -> Any:
+    key = _key(node, parts[0])
+    copy = dict(node) if isinstance(node, dict) else list(node)
+    if len(parts) > 1:
+        copy[key] = _patched(node[key], parts[1:], value)
+    elif value is REMOVE:
+        del copy[key]
+    else:
+        copy[key] = value
+    return copy
+
+
+def overlay(base: Any, patch: Dict[str, Any]) -> Any:
+    """``base`` with each ``path: value`` of ``patch`` applied, sharing everything untouched.
+
+    Replacing an existing key keeps its position; a new key is appended.
+    """
+    result = base
+    for path, value in patch.items():
+        result = _patched(result, path.split("/"), value)
+    return result
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class _Entry:
+    __slots__ = ("value", "uses", "plain", "encoded")
+
+    def __init__(self, value: Any, plain: bool):
+        self.value = value
+        # Times the subtree was referenced again after it was first interned
+        self.uses = 0
+        # No shared subtree below this one when it was interned
+        self.plain = plain
+        self.encoded: Optional[bytes] = None
+
+
+class InternTable:
+    """Hash-consing table: one canonical object per distinct JSON subtree."""
+
+    def __init__(self):
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._by_id: Dict[int, _Entry] = {}
+
+    def intern(self, value: Any) -> Any:
+        """Canonical object equal to ``value``; ``value`` itself when it is new."""
+        entry = self._by_id.get(id(value))
+        if entry is not None:
+            entry.uses += 1
+            return value
+        if isinstance(value, dict):
+            items = [(sys.intern(key) if isinstance(key, str) else key, self.intern(item))
+                     for key, item in value.items()]
+            key = (dict,) + tuple((name, *self._part(item)) for name, item in items)
+            fresh = all(item is value[name] for name, item in items)
+        elif isinstance(value, list):
+            items = [self.intern(item) for item in value]
+            key = (list,) + tuple(self._part(item) for item in items)
+            fresh = all(item is original for item, original in zip(items, value))
+        elif isinstance(value, str):
+            return sys.intern(value)
+        else:
+            return value
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.uses += 1
+            return entry.value
+        children = (item for _, item in items) if isinstance(value, dict) else items
+        plain = all(self._plain(item) for item in children)
+        if not fresh:
+            value = dict(items) if isinstance(value, dict) else items
+        self._entries[key] = self._by_id[id(value)] = _Entry(value, plain)
+        return value
+
+    def _part(self, item: Any) -> tuple:
+        # Children are canonical by now, so containers compare by identity
+        if isinstance(item, (dict, list)):
+            return (id(item),)
+        if isinstance(item, float):
+            # 0.0 == -0.0, but they encode differently
+            return (float, repr(item))
+        return (type(item), item)
+
+    def _plain(self, item: Any) -> bool:
+        entry = self._by_id.get(id(item))
+        return entry is None or (not entry.uses and entry.plain)
+
+    def encode(self, value: Any) -> bytes:
+        """Compact JSON for ``value``, reusing the bytes of shared subtrees.
+
+        Byte-identical to ``scenarios.encode``.
+        """
+        entry = self._by_id.get(id(value))
+        if entry is not None:
+            if entry.encoded is not None:
+                return entry.encoded
+            if entry.plain and not entry.uses:
+                # Nothing below is shared, so let the C encoder do the whole subtree
+                return _dumps(value)
+        if isinstance(value, dict):
+            if not all(isinstance(key, str) for key in value):
+                return _dumps(value)
+            body = b"{" + b",".join(_dumps(key) + b":" + self.encode(item) for key, item in value.items()) + b"}"
+        elif isinstance(value, list):
+            body = b"[" + b",".join(self.encode(item) for item in value) + b"]"
+        else:
+            return _dumps(value)
+        if entry is not None and entry.uses:
+            entry.encoded = body
+        return body
+
+    def stats(self) -> Dict[str, int]:
+        shared = [entry for entry in list(self._entries.values()) if entry.uses]
+        return {
+            "subtrees": len(self._entries),
+            "sharedSubtrees": len(shared),
+            "references": sum(entry.uses for entry in shared),
+            "encodedBytes": sum(len(entry.encoded) for entry in shared if entry.encoded is not None),
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,126 @@
+"""Cursor pagination over the record lists of member and coverage scenarios.
+
+Each record list is encoded once together with the byte offset of every
+element, so a page is a slice of the encoded list rather than a re-encode.
+Cursors are opaque: they carry the next record index and a checksum of the
+scenario body, so a cursor from a replaced scenario is rejected while one
+can still be reused with a different ``fields`` selection. Top-level keys
+besides the record list are kept on every page.
+"""
+import base64
+import binascii
+import zlib
+from array import array
+from typing import Any, Dict, Optional, Tuple
+
+from projection import Plan, project
+from scenarios import DEFAULT_MODELS, RECORD_KEYS, Scenario, encode
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+
+
+class EncodedList:
+    """Comma-joined encoded records with the start offset of each one."""
+
+    __slots__ = ("body", "offsets")
+
+    def __init__(self, records: list):
+        offsets = array("Q", [0])
+        parts = []
+        position = 0
+        for record in records:
+            part = encode(record)
+            parts.append(part)
+            position += len(part) + 1
+            offsets.append(position)
+        self.body = b",".join(parts)
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def slice(self, start: int, stop: int) -> memoryview:
+        """Encoded records ``start``..``stop`` without the trailing separator."""
+        if start >= stop:
+            return memoryview(b"")
+        return memoryview(self.body)[self.offsets[start]:self.offsets[stop] - 1]
+
+
+def encode_cursor(index: int, checksum: int) -> str:
+    raw = f"{index}:{checksum:x}".encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, checksum: int) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        index, cursor_checksum = raw.split(":")
+        index = int(index)
+        cursor_checksum = int(cursor_checksum, 16)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("invalid cursor")
+    if cursor_checksum != checksum:
+        raise ValueError("cursor does not match the current scenario data")
+    if index < 0:
+        raise ValueError("invalid cursor")
+    return index
+
+
+class EncodedPages:
+    """A payload encoded as ``head``, its record list, and ``tail`` (the keys after the list)."""
+
+    __slots__ = ("head", "records", "tail")
+
+    def __init__(self, payload: Dict[str, Any], record_key: str):
+        before, after = [], []
+        parts = before
+        for name, value in payload.items():
+            if name == record_key:
+                parts = after
+            elif name != "nextCursor":
+                parts.append(encode(name) + b":" + encode(value))
+        self.head = b"{" + b"".join(part + b"," for part in before) + encode(record_key) + b":["
+        self.records = EncodedList(payload[record_key])
+        self.tail = b"]" + b"".join(b"," + part for part in after)
+
+
+def encoded_pages(scenario: Scenario, plan: Optional[Plan] = None, key: Tuple = ()) -> EncodedPages:
+    """Encoded payload for a scenario (optionally projected), built once per variant."""
+    def build():
+        payload = scenario.payload if plan is None else project(scenario, plan)
+        return EncodedPages(payload, RECORD_KEYS[scenario.kind])
+    return scenario.derived(("pages",) + key, build)
+
+
+def page_body(
+    scenario: Scenario,
+    limit: Optional[int],
+    cursor: Optional[str],
+    plan: Optional[Plan] = None,
+    key: Tuple = (),
+) -> bytes:
+    """Encoded scenario with one page of its records, followed by ``nextCursor``.
+
+    Scenarios that are not record lists (error responses) are returned whole.
+    """
+    record_key = RECORD_KEYS.get(scenario.kind)
+    if record_key is None or scenario.model != DEFAULT_MODELS[scenario.kind]:
+        return scenario.encoded
+    limit = DEFAULT_LIMIT if limit is None else limit
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+
+    checksum = scenario.pinned("checksum", lambda: zlib.crc32(scenario.encoded))
+    pages = encoded_pages(scenario, plan, key)
+    records = pages.records
+    start = 0 if cursor is None else decode_cursor(cursor, checksum)
+    start = min(start, len(records))
+    stop = min(start + limit, len(records))
+    next_cursor = encode_cursor(stop, checksum) if stop < len(records) else None
+    return b"".join((
+        pages.head,
+        records.slice(start, stop),
+        pages.tail,
+        b',"nextCursor":', encode(next_cursor), b"}",
+    ))
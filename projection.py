@@ -0,0 +1,86 @@
+"""Field projection for scenario payloads (the ``fields=`` query parameter).
+
+``fields`` is a comma separated list of dotted paths, e.g.
+``subscriberID,memberEffective.startDate,name.memberName``. Paths are relative
+to each record (each entry of ``members`` / ``coverages``, or the whole
+accumulator body); lists along a path are projected element-wise.
+Compiled plans are cached per distinct field set; encoded projections are
+cached by the app's ResponseCache.
+"""
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from scenarios import DEFAULT_MODELS, RECORD_KEYS, Scenario
+
+# A compiled plan is a tuple of (key, sub-plan) pairs; a None sub-plan keeps
+# the whole value
+Plan = Tuple[Tuple[str, Optional["Plan"]], ...]
+
+
+def normalize_fields(fields: str) -> Tuple[str, ...]:
+    """Split, strip and sort a ``fields`` parameter so equal sets share one plan."""
+    paths = set()
+    for path in fields.split(","):
+        path = path.strip()
+        if not path:
+            continue
+        if any(not part for part in path.split(".")):
+            raise ValueError(f"invalid field path: {path!r}")
+        paths.add(path)
+    if not paths:
+        raise ValueError("fields must name at least one field")
+    return tuple(sorted(paths))
+
+
+@lru_cache(maxsize=1024)
+def compile_plan(paths: Tuple[str, ...]) -> Plan:
+    tree: Dict[str, Any] = {}
+    for path in paths:
+        node = tree
+        parts = path.split(".")
+        for part in parts[:-1]:
+            child = node.setdefault(part, {})
+            if child is None:
+                # A shorter path already keeps this whole subtree
+                break
+            node = child
+        else:
+            node[parts[-1]] = None
+    return _freeze(tree)
+
+
+def _freeze(tree: Dict[str, Any]) -> Plan:
+    return tuple((key, None if sub is None else _freeze(sub)) for key, sub in tree.items())
+
+
+def apply_plan(plan: Plan, value: Any) -> Any:
+    if isinstance(value, dict):
+        projected = {}
+        for key, sub in plan:
+            if key in value:
+                projected[key] = value[key] if sub is None else apply_plan(sub, value[key])
+        return projected
+    if isinstance(value, list):
+        return [apply_plan(plan, item) for item in value]
+    return value
+
+
+def project(scenario: Scenario, plan: Plan) -> Dict[str, Any]:
+    """Project a scenario payload; error and failure scenarios are returned whole.
+
+    Field paths apply to each record of list-shaped kinds (RECORD_KEYS) and to
+    the top-level object otherwise.
+    """
+    payload = scenario.payload
+    if scenario.model != DEFAULT_MODELS[scenario.kind]:
+        return payload
+    record_key = RECORD_KEYS.get(scenario.kind)
+    if record_key is None:
+        return apply_plan(plan, payload)
+    return {**payload, record_key: apply_plan(plan, payload[record_key])}
+
+
+def resolve_fields(fields: str) -> Tuple[Tuple[str, ...], Plan]:
+    """Normalized field paths (usable as a cache key) and their compiled plan."""
+    paths = normalize_fields(fields)
+    return paths, compile_plan(paths)
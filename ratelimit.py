@@ -0,0 +1,167 @@
+"""Token-bucket rate limiting so clients can exercise their 429 handling.
+
+Limits apply per client (a header such as ``X-Client-Id``, else the client
+IP), globally and optionally per route prefix. Bucket state lives in an
+insertion-ordered table: every request moves its bucket to the end, so idle
+buckets collect at the front and are evicted a few at a time, keeping both
+lookups and cleanup O(1).
+
+Configuration comes from ``create_app(rate_limits=...)`` or the environment::
+
+    MOCK_RATE_LIMIT=10:20                        # 10 req/s, bursts of 20
+    MOCK_RATE_LIMIT_ROUTES=/searchAccums=2:5;/searchMembers=50
+    MOCK_RATE_LIMIT_HEADER=X-Client-Id
+"""
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+IDLE_TTL = 300.0
+MAX_CLIENTS = 500_000
+# Idle buckets evicted per request at most, to keep cleanup amortized
+EVICT_BATCH = 4
+
+
+class RateLimit(NamedTuple):
+    rate: float
+    burst: float
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimit":
+        """Parse ``RATE[:BURST]`` (requests per second); burst defaults to the rate."""
+        rate, _, burst = spec.partition(":")
+        limit = cls(float(rate), float(burst or rate))
+        if limit.rate <= 0 or limit.burst < 1:
+            raise ValueError(f"invalid rate limit {spec!r}")
+        return limit
+
+
+class RateLimitConfig(NamedTuple):
+    default: Optional[RateLimit] = None
+    routes: Tuple[Tuple[str, RateLimit], ...] = ()
+    client_header: str = "X-Client-Id"
+
+    @classmethod
+    def from_env(cls) -> Optional["RateLimitConfig"]:
+        default = os.environ.get("MOCK_RATE_LIMIT")
+        routes = []
+        for entry in filter(None, os.environ.get("MOCK_RATE_LIMIT_ROUTES", "").split(";")):
+            prefix, _, spec = entry.partition("=")
+            routes.append((prefix.strip(), RateLimit.parse(spec.strip())))
+        if not default and not routes:
+            return None
+        return cls(
+            default=RateLimit.parse(default) if default else None,
+            routes=tuple(routes),
+            client_header=os.environ.get("MOCK_RATE_LIMIT_HEADER", "X-Client-Id"),
+        )
+
+
+class TokenBucketTable:
+    """Token buckets for one limit, keyed by client."""
+
+    def __init__(self, limit: RateLimit, idle_ttl: float = IDLE_TTL, max_entries: int = MAX_CLIENTS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.limit = limit
+        # An evicted bucket must be indistinguishable from a full one
+        self.idle_ttl = max(idle_ttl, limit.burst / limit.rate)
+        self.max_entries = max_entries
+        self.clock = clock
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def take(self, key: str) -> float:
+        """Consume a token for ``key``; return 0 if allowed, else seconds until one is available."""
+        wait = self.check(key)
+        if not wait:
+            self.spend(key)
+        return wait
+
+    def check(self, key: str) -> float:
+        """Refill ``key``'s bucket; return 0 if it holds a token, else seconds until it will."""
+        now = self.clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.limit.burst, now]
+        else:
+            bucket[0] = min(self.limit.burst, bucket[0] + (now - bucket[1]) * self.limit.rate)
+            bucket[1] = now
+            self._buckets.move_to_end(key)
+        self._evict(now)
+        return 0.0 if bucket[0] >= 1 else (1 - bucket[0]) / self.limit.rate
+
+    def spend(self, key: str):
+        """Consume the token ``check`` just found for ``key``."""
+        self._buckets[key][0] -= 1
+
+    def _evict(self, now: float):
+        for _ in range(EVICT_BATCH):
+            key, (_, last) = next(iter(self._buckets.items()))
+            if now - last < self.idle_ttl and len(self._buckets) <= self.max_entries:
+                return
+            del self._buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+async def reject(send, wait: float):
+    """Send ``429 Too Many Requests`` with a ``Retry-After`` of ``wait`` seconds, rounded up."""
+    body = b'{"detail":"Too Many Requests"}'
+    await send({
+        "type": "http.response.start",
+        "status": 429,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(wait))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class RateLimitMiddleware:
+    """ASGI middleware answering 429 with Retry-After once a client's bucket is empty."""
+
+    def __init__(self, app, config: RateLimitConfig, cluster=None):
+        self.app = app
+        self.cluster = cluster
+        self.header = config.client_header.lower().encode("latin-1")
+        self.default = TokenBucketTable(config.default) if config.default else None
+        self.routes = [(prefix, TokenBucketTable(limit)) for prefix, limit in config.routes]
+
+    def _client(self, scope) -> str:
+        client = None
+        for name, value in scope.get("headers", ()):
+            if name == self.header:
+                client = value.decode("latin-1")
+                break
+        if client is None:
+            address = scope.get("client")
+            client = address[0] if address else "anonymous"
+        # Tenants are limited separately even when their clients send the same ID
+        tenant = scope.get("tenant")
+        return client if tenant is None else f"{tenant.name}/{client}"
+
+    async def __call__(self, scope, receive, send):
+        # Requests forwarded by a cluster peer were already charged where they arrived
+        if scope["type"] != "http" or (self.cluster is not None and self.cluster.forwarded(scope)):
+            await self.app(scope, receive, send)
+            return
+        client = self._client(scope)
+        path = scope["path"]
+        tables = [self.default] if self.default is not None else []
+        for prefix, table in self.routes:
+            if path.startswith(prefix):
+                tables.append(table)
+                break
+        # A request is charged only when every applicable bucket lets it through
+        wait = max((table.check(client) for table in tables), default=0.0)
+        if wait:
+            await reject(send, wait)
+            return
+        for table in tables:
+            table.spend(client)
+        await self.app(scope, receive, send)
+
@@ -0,0 +1,257 @@
+"""Replay an NDJSON request log against the mock API.
+
+Each line of the log is a JSON object describing one request::
+
+    {"ts": 1724577600.125, "method": "GET", "path": "/searchMemberById/m-a"}
+
+Only ``path`` is required. ``method`` defaults to GET, ``headers`` and
+``body`` are sent as-is, and ``ts`` (epoch seconds) drives the recorded
+inter-arrival timing. Lines that are not request objects, or whose ``path``
+is not a string or ``headers`` not an object of strings, are skipped.
+
+Usage:
+    python replay.py traffic.ndjson --base-url http://localhost:8000 --speed 2
+    python replay.py traffic.ndjson.gz --app main:app --speed max
+"""
+import argparse
+import asyncio
+import gzip
+import importlib
+import json
+import math
+import sys
+import time
+from typing import Any, Dict, Iterator, NamedTuple, Optional
+
+import httpx
+
+
+class ReplayRequest(NamedTuple):
+    method: str
+    path: str
+    ts: Optional[float]
+    headers: Optional[Dict[str, str]]
+    body: Any
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with ~1% relative error and constant memory."""
+
+    GROWTH = 1.01
+
+    def __init__(self):
+        self._log_growth = math.log(self.GROWTH)
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        micros = max(seconds * 1e6, 1.0)
+        index = int(math.log(micros) / self._log_growth)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, pct: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * pct / 100.0)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.GROWTH ** (index + 1) / 1e6, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1e3,
+            "min_ms": self.min * 1e3,
+            "p50_ms": self.percentile(50) * 1e3,
+            "p90_ms": self.percentile(90) * 1e3,
+            "p99_ms": self.percentile(99) * 1e3,
+            "p999_ms": self.percentile(99.9) * 1e3,
+            "max_ms": self.max * 1e3,
+        }
+
+
+class ReplayReport:
+    """Aggregated outcome of a replay run."""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.schedule_lag = LatencyHistogram()
+        self.statuses: Dict[int, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.skipped_lines = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        sent = self.latency.count + sum(self.errors.values())
+        return {
+            "requests": sent,
+            "elapsed_s": self.elapsed,
+            "throughput_rps": sent / self.elapsed if self.elapsed else 0.0,
+            "latency": self.latency.summary(),
+            "schedule_lag": self.schedule_lag.summary(),
+            "statuses": {str(code): n for code, n in sorted(self.statuses.items())},
+            "errors": self.errors,
+            "skipped_lines": self.skipped_lines,
+        }
+
+
+def _open_log(path: str):
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def _headers(value: Any) -> bool:
+    return value is None or (
+        isinstance(value, dict) and all(isinstance(item, str) for item in value.values())
+    )
+
+
+def iter_requests(path: str, report: Optional[ReplayReport] = None) -> Iterator[ReplayRequest]:
+    """Stream requests from an NDJSON log one line at a time."""
+    with _open_log(path) as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+                request_path = entry["path"]
+            except (ValueError, KeyError, TypeError):
+                entry = None
+            if entry is None or not isinstance(request_path, str) or not _headers(entry.get("headers")):
+                if report is not None:
+                    report.skipped_lines += 1
+                continue
+            ts = entry.get("ts", entry.get("timestamp"))
+            yield ReplayRequest(
+                method=str(entry.get("method", "GET")).upper(),
+                path=request_path,
+                ts=float(ts) if isinstance(ts, (int, float)) else None,
+                headers=entry.get("headers"),
+                body=entry.get("body"),
+            )
+
+
+def load_app(target: str):
+    """Import an ASGI app from a ``module:attribute`` string."""
+    module_name, _, attribute = target.partition(":")
+    return getattr(importlib.import_module(module_name), attribute or "app")
+
+
+def build_client(base_url: Optional[str] = None, app: Any = None, concurrency: int = 64) -> httpx.AsyncClient:
+    """Create a keep-alive pooled client for either a live server or an in-process app."""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    if app is not None:
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mock", limits=limits)
+    return httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0)
+
+
+async def _send(client: httpx.AsyncClient, request: ReplayRequest, report: ReplayReport, slots: asyncio.Semaphore):
+    try:
+        started = time.perf_counter()
+        kwargs: Dict[str, Any] = {"headers": request.headers}
+        if request.body is not None:
+            kwargs["json"] = request.body
+        response = await client.request(request.method, request.path, **kwargs)
+        await response.aread()
+        report.latency.record(time.perf_counter() - started)
+        report.statuses[response.status_code] = report.statuses.get(response.status_code, 0) + 1
+    except Exception as exc:
+        # Transport errors, and with --app any exception the app raises, count
+        # against the request instead of ending the replay
+        name = type(exc).__name__
+        report.errors[name] = report.errors.get(name, 0) + 1
+    finally:
+        slots.release()
+
+
+async def replay(
+    path: str,
+    client: httpx.AsyncClient,
+    speed: Optional[float] = 1.0,
+    concurrency: int = 64,
+    limit: Optional[int] = None,
+) -> ReplayReport:
+    """Replay the log at ``speed`` times the recorded rate, or flat out when ``speed`` is None.
+
+    At most ``concurrency`` requests are in flight; reading the log pauses
+    while all slots are busy, so memory stays constant regardless of log size.
+    """
+    report = ReplayReport()
+    slots = asyncio.Semaphore(concurrency)
+    in_flight = set()
+    first_ts = None
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    for sent, request in enumerate(iter_requests(path, report)):
+        if limit is not None and sent >= limit:
+            break
+        if speed and request.ts is not None:
+            if first_ts is None:
+                first_ts = request.ts
+            due = start + (request.ts - first_ts) / speed
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                report.schedule_lag.record(-delay)
+        await slots.acquire()
+        task = asyncio.ensure_future(_send(client, request, report, slots))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    report.elapsed = time.perf_counter() - report.started
+    return report
+
+
+def _parse_speed(value: str) -> Optional[float]:
+    if value.lower() in ("max", "0", "none"):
+        return None
+    speed = float(value)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive or 'max'")
+    return speed
+
+
+async def _main(args: argparse.Namespace) -> Dict[str, Any]:
+    app = load_app(args.app) if args.app else None
+    async with build_client(args.base_url, app, args.concurrency) as client:
+        report = await replay(args.log, client, args.speed, args.concurrency, args.limit)
+    return report.to_dict()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay an NDJSON request log against the mock API")
+    parser.add_argument("log", help="NDJSON request log (.gz supported, '-' for stdin)")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--base-url", default="http://localhost:8000", help="Server to replay against")
+    target.add_argument("--app", help="Replay in-process against an ASGI app, e.g. main:app")
+    parser.add_argument("--speed", type=_parse_speed, default=1.0,
+                        help="Multiple of the recorded rate, or 'max' to ignore timing (default: 1)")
+    parser.add_argument("--concurrency", type=int, default=64, help="Maximum requests in flight")
+    parser.add_argument("--limit", type=int, help="Stop after this many requests")
+    args = parser.parse_args(argv)
+    print(json.dumps(asyncio.run(_main(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
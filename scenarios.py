@@ -0,0 +1,211 @@
+"""Scenario registry mapping endpoint IDs to canned payloads.
+
+The default fixtures and response models are only imported when a scenario
+is first looked up, so creating the app stays cheap.
+"""
+import json
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from overlays import InternTable
+
+MEMBER = "member"
+COVERAGE = "coverage"
+ACCUM = "accum"
+
+# Response model used to validate each kind unless a scenario overrides it
+DEFAULT_MODELS = {
+    MEMBER: "MemberResponse",
+    COVERAGE: "CoverageResponse",
+    ACCUM: "AccumulatorResponse",
+}
+
+# List key holding the individual records of each list-shaped kind
+RECORD_KEYS = {
+    MEMBER: "members",
+    COVERAGE: "coverages",
+}
+
+# (kind, scenario ID, fixture name, response model, description)
+DEFAULT_SCENARIOS = [
+    (MEMBER, "m-a", "MEMBER_RESPONSE_MA", "MemberResponse", "Search for member with ID 'm-a'"),
+    (MEMBER, "m-b-m-n", "MEMBER_RESPONSE_MBMN", "MemberResponse", "Search for member with ID 'm-b-m-n'"),
+    (MEMBER, "m-n-a-c", "MEMBER_RESPONSE_MNAC", "MemberResponse", "Search for member with ID 'm-n-a-c'"),
+    (MEMBER, "m-e-r", "ERROR_RESPONSE", "ErrorResponse", "Error response for member search"),
+    (COVERAGE, "c-s", "COVERAGE_RESPONSE_CS", "CoverageResponse", "Search for coverage with ID 'c-s'"),
+    (COVERAGE, "c-n-m-id", "COVERAGE_RESPONSE_CNMID", "CoverageResponse", "Search for coverage with ID 'c-n-m-id'"),
+    (COVERAGE, "c-n-a-c", "COVERAGE_RESPONSE_CNAC", "CoverageResponse", "Search for coverage with ID 'c-n-a-c'"),
+    (COVERAGE, "c-e-r", "ERROR_RESPONSE", "ErrorResponse", "Error response for coverage search"),
+    (ACCUM, "acc-succ", "ACCUM_RESPONSE_SUCC", "AccumulatorResponse", "Search for accumulator with ID 'acc-succ'"),
+    (ACCUM, "acc-rem-amt-miss", "ACCUM_RESPONSE_REM_AMT_MISS", "AccumulatorResponse",
+     "Search for accumulator with ID 'acc-rem-amt-miss'"),
+    (ACCUM, "acc-f", "ACCUM_RESPONSE_F", "FailedAccumulatorResponse",
+     "Search for accumulator with ID 'acc-f' (failure case)"),
+]
+
+
+# Evictable variants (page offsets, as-of views, ...) kept per scenario
+MAX_VARIANTS = 32
+
+# Replacements tolerated before the intern table is rebuilt from live payloads
+MIN_COMPACT_REPLACEMENTS = 64
+
+
+def encode(payload: Any) -> bytes:
+    """Encode a payload exactly the way FastAPI's JSONResponse would."""
+    return json.dumps(
+        payload,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class Scenario:
+    """A canned payload plus its lazily encoded response body."""
+
+    __slots__ = (
+        "kind", "scenario_id", "payload", "model", "description", "revision", "encoder", "_encoded", "_derived",
+        "_pinned",
+    )
+
+    def __init__(
+        self,
+        kind: str,
+        scenario_id: str,
+        payload: Dict[str, Any],
+        model: str,
+        description: str = "",
+        revision: int = 0,
+        encoder: Callable[[Any], bytes] = encode,
+    ):
+        self.kind = kind
+        self.scenario_id = scenario_id
+        self.payload = payload
+        self.model = model
+        self.description = description
+        # Registry version at registration; distinguishes a replaced scenario in cache keys
+        self.revision = revision
+        self.encoder = encoder
+        self._encoded: Optional[bytes] = None
+        # Variants in least- to most-recently used order
+        self._derived: Dict[Any, Any] = {}
+        self._pinned: Dict[Any, Any] = {}
+
+    @property
+    def encoded(self) -> bytes:
+        if self._encoded is None:
+            self._encoded = self.encoder(self.payload)
+        return self._encoded
+
+    def cached(self) -> Dict[Any, Any]:
+        """Derived structures currently held, plus the encoded body once built."""
+        cached = {**self._pinned, **self._derived}
+        if self._encoded is not None:
+            cached["encoded"] = self._encoded
+        return cached
+
+    def derived(self, key: Any, build: Callable[[], Any]) -> Any:
+        """Return a variant derived from this scenario, keeping the most recently used ones."""
+        value = self._derived.pop(key, None)
+        if value is None:
+            value = build()
+            if len(self._derived) >= MAX_VARIANTS:
+                del self._derived[next(iter(self._derived))]
+        self._derived[key] = value
+        return value
+
+    def pinned(self, key: Any, build: Callable[[], Any]) -> Any:
+        """Return a structure derived from this scenario, built once and never evicted."""
+        if key not in self._pinned:
+            self._pinned[key] = build()
+        return self._pinned[key]
+
+
+class ScenarioRegistry:
+    """Holds every scenario the mock can serve, keyed by (kind, scenario ID)."""
+
+    def __init__(self, load_defaults: bool = True):
+        self._scenarios: Dict[Tuple[str, str], Scenario] = {}
+        self._listeners: List[Callable[[Scenario], None]] = []
+        self._loaded = not load_defaults
+        # Shares identical subtrees (and their encoded bytes) between payloads
+        self.interned = InternTable()
+        self._replaced = 0
+        self.version = 0
+        # Version after the default fixtures loaded; later revisions are runtime registrations
+        self.baseline = 0
+
+    def load(self):
+        """Load the default fixtures, once; lookups call this implicitly."""
+        if self._loaded:
+            return
+        self._loaded = True
+        import fixtures
+        for kind, scenario_id, fixture, model, description in DEFAULT_SCENARIOS:
+            self.register(kind, scenario_id, getattr(fixtures, fixture), model, description)
+        self.baseline = self.version
+
+    def register(
+        self,
+        kind: str,
+        scenario_id: str,
+        payload: Dict[str, Any],
+        model: Optional[str] = None,
+        description: str = "",
+    ) -> Scenario:
+        """Validate and add (or replace) a scenario, then notify listeners."""
+        import models
+        self.load()
+        model = model or DEFAULT_MODELS[kind]
+        models.validate(model, payload)
+        self.version += 1
+        scenario = Scenario(kind, scenario_id, self.interned.intern(payload), model, description, self.version,
+                            self._encode)
+        replaced = (kind, scenario_id) in self._scenarios
+        self._scenarios[(kind, scenario_id)] = scenario
+        if replaced:
+            self._replaced += 1
+            if self._replaced > max(len(self._scenarios), MIN_COMPACT_REPLACEMENTS):
+                self._compact()
+        for listener in self._listeners:
+            listener(scenario)
+        return scenario
+
+    def _encode(self, payload: Any) -> bytes:
+        return self.interned.encode(payload)
+
+    def _compact(self):
+        """Rebuild the intern table from live payloads, dropping subtrees only replaced scenarios used."""
+        self.interned = InternTable()
+        self._replaced = 0
+        for scenario in self._scenarios.values():
+            # Live payloads are already canonical, so this re-registers the same objects
+            self.interned.intern(scenario.payload)
+
+    def get(self, kind: str, scenario_id: str) -> Optional[Scenario]:
+        self.load()
+        return self._scenarios.get((kind, scenario_id))
+
+    def scenarios(self, kind: Optional[str] = None) -> Iterator[Scenario]:
+        self.load()
+        for scenario in list(self._scenarios.values()):
+            if kind is None or scenario.kind == kind:
+                yield scenario
+
+    def runtime_scenarios(self) -> Iterator[Scenario]:
+        """Scenarios registered (or replaced) after the defaults were loaded."""
+        for scenario in self.scenarios():
+            if scenario.revision > self.baseline:
+                yield scenario
+
+    def add_listener(self, listener: Callable[[Scenario], None]):
+        """Call ``listener`` for every scenario registered now and later."""
+        self._listeners.append(listener)
+        if self._loaded:
+            for scenario in list(self._scenarios.values()):
+                listener(scenario)
+
+    def __len__(self) -> int:
+        self.load()
+        return len(self._scenarios)
@@ -0,0 +1,213 @@
+"""Isolated scenario namespaces for teams sharing one mock host.
+
+A request selects its tenant with the ``X-Mock-Tenant`` header or a
+``/t/{tenant}`` path prefix (``/t/team-a/searchMemberById/m-a``). Requests
+naming no tenant use the default tenant, whose state is the app's own.
+
+Every tenant has its own scenario registry, starting from the default
+fixtures, and everything derived from it: indexes, catalog and accumulator
+stream. It also has its own encoded response cache, a byte budget for the
+scenarios it registers and an optional request quota. One tenant's catalog
+or traffic therefore never evicts or throttles another's. The default tenant
+gets the same cache size, budget and quota as the others, so untenanted
+traffic cannot crowd out named tenants either. Resolving a tenant is one
+dict lookup. Tenants are created on first use, up to a limit::
+
+    MOCK_MAX_TENANTS=64
+    MOCK_TENANT_CACHE_MAX_BYTES=16777216     # response cache per tenant (else MOCK_CACHE_MAX_BYTES)
+    MOCK_TENANT_SCENARIO_MAX_BYTES=67108864  # encoded scenarios registered per tenant
+    MOCK_TENANT_RATE_LIMIT=200:400           # requests/s per tenant, all clients together
+"""
+import os
+import re
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Tuple
+
+from cache import DEFAULT_MAX_BYTES, ResponseCache
+from catalog import Catalog
+from events import Broadcaster
+from indexes import attach_indexes
+from intervals import index_scenario
+from ngrams import NameIndex
+from ratelimit import RateLimit, TokenBucketTable, reject
+from scenarios import Scenario, ScenarioRegistry, encode
+
+DEFAULT_TENANT = "default"
+TENANT_HEADER = b"x-mock-tenant"
+PATH_PREFIX = "/t/"
+
+_TENANT_NAME = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+
+class TenantBudgetExceeded(Exception):
+    """Raised when a registration would take a tenant past its scenario byte budget."""
+
+
+class TenantConfig(NamedTuple):
+    max_tenants: int = 64
+    cache_max_bytes: int = 16 * 1024 * 1024
+    scenario_max_bytes: Optional[int] = 64 * 1024 * 1024
+    quota: Optional[RateLimit] = None
+
+    @classmethod
+    def from_env(cls) -> "TenantConfig":
+        quota = os.environ.get("MOCK_TENANT_RATE_LIMIT")
+        return cls(
+            max_tenants=int(os.environ.get("MOCK_MAX_TENANTS", cls._field_defaults["max_tenants"])),
+            cache_max_bytes=int(os.environ.get(
+                "MOCK_TENANT_CACHE_MAX_BYTES",
+                os.environ.get("MOCK_CACHE_MAX_BYTES", cls._field_defaults["cache_max_bytes"]),
+            )),
+            scenario_max_bytes=int(
+                os.environ.get("MOCK_TENANT_SCENARIO_MAX_BYTES", cls._field_defaults["scenario_max_bytes"])
+            ),
+            quota=RateLimit.parse(quota) if quota else None,
+        )
+
+
+class Tenant:
+    """One namespace: a scenario registry, its derived structures, cache and quotas."""
+
+    def __init__(
+        self,
+        name: str,
+        registry: Optional[ScenarioRegistry] = None,
+        cache_max_bytes: int = DEFAULT_MAX_BYTES,
+        scenario_max_bytes: Optional[int] = None,
+        quota: Optional[RateLimit] = None,
+        title: str = "",
+        version: str = "",
+    ):
+        self.name = name
+        self.registry = registry or ScenarioRegistry()
+        self.registry.add_listener(index_scenario)
+        self.indexes = attach_indexes(self.registry)
+        self.name_index = NameIndex()
+        self.registry.add_listener(self.name_index.index_scenario)
+        self.response_cache = ResponseCache(cache_max_bytes)
+        self.events = Broadcaster()
+        self.registry.add_listener(self.events.publish_accumulator)
+        self.catalog = Catalog(self.registry, title, version)
+        self.scenario_max_bytes = scenario_max_bytes
+        # Encoded size of each scenario registered at runtime, charged to the budget
+        self.scenario_sizes: Dict[Tuple[str, str], int] = {}
+        self.scenario_bytes = 0
+        self.quota = TokenBucketTable(quota) if quota else None
+
+    def register(self, kind: str, scenario_id: str, payload: Dict[str, Any]) -> Scenario:
+        """Register a scenario, keeping this tenant's runtime scenarios within budget."""
+        key = (kind, scenario_id)
+        size = len(encode(payload))
+        total = self.scenario_bytes - self.scenario_sizes.get(key, 0) + size
+        if self.scenario_max_bytes is not None and total > self.scenario_max_bytes:
+            raise TenantBudgetExceeded(
+                f"tenant {self.name!r} would hold {total} bytes of scenarios, over its "
+                f"budget of {self.scenario_max_bytes}"
+            )
+        scenario = self.registry.register(kind, scenario_id, payload)
+        self.scenario_sizes[key] = size
+        self.scenario_bytes = total
+        return scenario
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "scenarios": len(self.registry),
+            "scenarioBytes": self.scenario_bytes,
+            "scenarioMaxBytes": self.scenario_max_bytes,
+            "cache": self.response_cache.stats(),
+        }
+
+
+class Tenants:
+    """Tenants by name; unknown names are created on first use up to ``max_tenants``."""
+
+    def __init__(self, default: Tenant, config: TenantConfig = TenantConfig(), title: str = "", version: str = ""):
+        self.default = default
+        self.config = config
+        self.title = title
+        self.version = version
+        self._tenants: Dict[str, Tenant] = {default.name: default}
+
+    def get(self, name: str) -> Optional[Tenant]:
+        tenant = self._tenants.get(name)
+        if tenant is None and len(self._tenants) < self.config.max_tenants and _TENANT_NAME.match(name):
+            tenant = self._tenants[name] = Tenant(
+                name,
+                cache_max_bytes=self.config.cache_max_bytes,
+                scenario_max_bytes=self.config.scenario_max_bytes,
+                quota=self.config.quota,
+                title=self.title,
+                version=self.version,
+            )
+        return tenant
+
+    def path_prefix(self, tenant: Tenant) -> str:
+        """Path prefix selecting ``tenant``; the default tenant has none."""
+        return "" if tenant is self.default else PATH_PREFIX + tenant.name
+
+    def registries(self) -> Iterator[Tuple[str, ScenarioRegistry]]:
+        """(path prefix, registry) of every tenant; the default tenant has no prefix."""
+        for tenant in list(self._tenants.values()):
+            yield self.path_prefix(tenant), tenant.registry
+
+    def __iter__(self) -> Iterator[Tenant]:
+        return iter(list(self._tenants.values()))
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+
+def tenant_of(request) -> Tenant:
+    """Tenant selected for a request by ``TenantMiddleware``."""
+    return request.scope["tenant"]
+
+
+class TenantMiddleware:
+    """ASGI middleware resolving the tenant of each request and applying its quota.
+
+    A ``/t/{tenant}`` prefix is moved from ``path`` to ``root_path``, so routes
+    and the middleware below it see the same paths as for the default tenant.
+    """
+
+    def __init__(self, app, tenants: Tenants, cluster=None):
+        self.app = app
+        self.tenants = tenants
+        self.cluster = cluster
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        name = None
+        path = scope["path"]
+        if path.startswith(PATH_PREFIX):
+            name, slash, rest = path[len(PATH_PREFIX):].partition("/")
+            root_path = scope.get("root_path", "") + PATH_PREFIX + name
+            scope = {**scope, "path": (slash + rest) or "/", "root_path": root_path}
+        else:
+            for header, value in scope["headers"]:
+                if header == TENANT_HEADER:
+                    name = value.decode("latin-1")
+                    break
+        tenant = self.tenants.default if name is None else self.tenants.get(name)
+        if tenant is None:
+            await self._respond(send, 404, b'{"detail":"unknown tenant"}')
+            return
+        # Requests forwarded by a cluster peer were already charged where they arrived
+        forwarded = self.cluster is not None and self.cluster.forwarded(scope)
+        if tenant.quota is not None and not forwarded:
+            wait = tenant.quota.take(tenant.name)
+            if wait:
+                await reject(send, wait)
+                return
+        scope["tenant"] = tenant
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _respond(send, status: int, body: bytes):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
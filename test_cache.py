@@ -0,0 +1,95 @@
+import asyncio
+import threading
+
+import pytest
+
+from cache import ResponseCache
+
+
+def test_hits_return_the_cached_body_without_rebuilding():
+    cache = ResponseCache()
+    builds = []
+
+    async def run():
+        first = await cache.get("k", lambda: builds.append(1) or b"body")
+        second = await cache.get("k", lambda: builds.append(1) or b"other")
+        return first, second
+
+    assert asyncio.run(run()) == (b"body", b"body")
+    assert len(builds) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_concurrent_misses_share_one_build():
+    cache = ResponseCache()
+    release = threading.Event()
+    builds = []
+
+    def build():
+        builds.append(1)
+        release.wait(5)
+        return b"body"
+
+    async def run():
+        waiters = [asyncio.ensure_future(cache.get("k", build)) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(run()) == [b"body"] * 5
+    assert len(builds) == 1
+    assert (cache.misses, cache.coalesced) == (1, 4)
+
+
+def test_byte_budget_evicts_least_recently_used():
+    cache = ResponseCache(max_bytes=10)
+
+    async def run():
+        await cache.get("a", lambda: b"aaaa")
+        await cache.get("b", lambda: b"bbbb")
+        await cache.get("a", lambda: b"")
+        await cache.get("c", lambda: b"cccc")
+        await cache.get("huge", lambda: b"x" * 11)
+
+    asyncio.run(run())
+    assert list(cache._entries) == ["a", "c"]
+    assert (cache.bytes, cache.evictions) == (8, 1)
+
+
+def test_a_cancelled_leader_does_not_fail_its_followers():
+    cache = ResponseCache()
+    release = threading.Event()
+
+    def build():
+        release.wait(5)
+        return b"body"
+
+    async def run():
+        leader = asyncio.ensure_future(cache.get("k", build))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(cache.get("k", build))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        await asyncio.sleep(0.01)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        body = await follower
+        await asyncio.sleep(0)
+        return body
+
+    assert asyncio.run(run()) == b"body"
+    assert list(cache._entries) == ["k"]
+
+
+def test_a_failed_build_is_raised_to_every_waiter_and_not_cached():
+    cache = ResponseCache()
+
+    def build():
+        raise ValueError("bad fields")
+
+    async def run():
+        return await asyncio.gather(cache.get("k", build), cache.get("k", build), return_exceptions=True)
+
+    assert [type(result) for result in asyncio.run(run())] == [ValueError, ValueError]
+    assert not cache._entries and not cache._building
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from catalog import DEFAULT_PAGE_SIZE, Catalog
+from scenarios import ACCUM, MEMBER, ScenarioRegistry
+
+
+def _catalog(extra=0):
+    registry = ScenarioRegistry()
+    for n in range(extra):
+        registry.register(ACCUM, f"acc-{n:03d}", {"member": {}, "planBenefitsAndAccums": []})
+    return registry, Catalog(registry, "Mock", "1.0")
+
+
+def test_small_catalog_is_served_whole_without_a_cursor():
+    _, catalog = _catalog()
+    body = json.loads(catalog.page())
+
+    assert body["message"] == "Mock" and body["version"] == "1.0"
+    assert len(body["endpoints"]) == 11 and "nextCursor" not in body
+    assert body["endpoints"][0] == {
+        "path": "/searchMemberById/m-a", "methods": ["GET"], "description": "Search for member with ID 'm-a'",
+    }
+
+
+def test_default_page_is_cut_at_the_page_size():
+    _, catalog = _catalog(extra=150)
+    body = json.loads(catalog.page())
+
+    assert len(body["endpoints"]) == DEFAULT_PAGE_SIZE
+    assert body["nextCursor"] is not None
+
+
+def test_cursor_pages_cover_every_entry_once():
+    _, catalog = _catalog(extra=150)
+    paths, cursor = [], None
+    while True:
+        body = json.loads(catalog.page(limit=40, cursor=cursor))
+        paths += [entry["path"] for entry in body["endpoints"]]
+        cursor = body["nextCursor"]
+        if cursor is None:
+            break
+
+    assert len(paths) == len(set(paths)) == 161
+
+
+def test_registering_a_scenario_invalidates_the_catalog():
+    registry, catalog = _catalog()
+    before = catalog.page()
+    assert catalog.page() is before
+
+    registry.register(MEMBER, "new", {"members": []})
+    after = json.loads(catalog.page())
+    assert after["endpoints"][-1]["path"] == "/searchMemberById/new"
+
+
+@pytest.mark.parametrize("limit, cursor", [(0, None), (1001, None), (10, "not-a-cursor")])
+def test_bad_page_requests_raise_value_error(limit, cursor):
+    _, catalog = _catalog()
+    with pytest.raises(ValueError):
+        catalog.page(limit=limit, cursor=cursor)
+
+
+def test_openapi_is_encoded_once_and_served_per_tenant_prefix():
+    from fastapi.testclient import TestClient
+
+    from main import create_app
+
+    app = create_app()
+    client = TestClient(app)
+    first = client.get("/openapi.json")
+    calls = []
+    app.openapi = lambda: calls.append(1) or {}
+
+    assert client.get("/openapi.json").content == first.content and not calls
+    tenant = client.get("/t/team/openapi.json").json()
+    assert calls == [1] and tenant == {"servers": [{"url": "/t/team"}]}
@@ -0,0 +1,49 @@
+import asyncio
+
+from client import MockAPIError, MockClient
+from main import create_app
+from scenarios import ACCUM, MEMBER
+
+
+def _run(test):
+    async def run():
+        async with MockClient(app=create_app()) as mock:
+            return await test(mock)
+    return asyncio.run(run())
+
+
+def test_lookup_returns_the_projected_payload():
+    async def test(mock):
+        return await mock.member("m-a", fields="name.memberName.fullName")
+
+    assert _run(test) == {"members": [{"name": {"memberName": {"fullName": "TEST USER"}}}]}
+
+
+def test_batch_keeps_order_and_puts_errors_in_place():
+    async def test(mock):
+        return await mock.batch(ACCUM, ["acc-succ", "missing", "acc-f"], fields="member.subscriberId")
+
+    first, missing, last = _run(test)
+    assert set(first) == {"member"} and set(last) >= {"member"}
+    assert isinstance(missing, MockAPIError) and missing.status_code == 404
+
+
+def test_records_follows_cursors_across_pages():
+    members = [{"subscriberID": f"S{n}"} for n in range(7)]
+
+    async def test(mock):
+        await mock.register(MEMBER, "many", {"members": members})
+        return [record async for record in mock.records(MEMBER, "many", page_size=3)]
+
+    assert _run(test) == members
+
+
+def test_error_statuses_raise_with_the_detail():
+    async def test(mock):
+        try:
+            await mock.register("nope", "x", {})
+        except MockAPIError as exc:
+            return exc
+
+    error = _run(test)
+    assert error.status_code == 404 and "unknown scenario kind" in error.detail
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+
+import cluster
+from cluster import Cluster, HashRing
+
+
+def test_hash_ring_keeps_owners_when_a_node_joins():
+    ring = HashRing(["http://a", "http://b"])
+    keys = [f"m-{n}" for n in range(1000)]
+    before = {key: ring.owner(key) for key in keys}
+    ring.add("http://c")
+    moved = [key for key in keys if ring.owner(key) != before[key]]
+
+    assert all(ring.owner(key) == "http://c" for key in moved)
+    assert 0 < len(moved) < len(keys) / 2
+
+
+def test_join_is_retried_with_backoff_and_failures_are_logged(monkeypatch, caplog):
+    node = Cluster("http://a", ["http://seed"], secret="s3cret")
+    attempts = []
+
+    async def join(tenants):
+        attempts.append(tenants)
+        if len(attempts) < 3:
+            raise OSError("seed not up")
+
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(node, "join", join)
+    monkeypatch.setattr(cluster.asyncio, "sleep", sleep)
+    with caplog.at_level(logging.WARNING, logger="cluster"):
+        asyncio.run(node.join_with_retry("tenants"))
+
+    assert len(attempts) == 3
+    assert delays == [cluster.JOIN_BACKOFF_SECONDS, cluster.JOIN_BACKOFF_SECONDS * 2]
+    assert [record.getMessage().split(",")[0] for record in caplog.records] == [
+        "joining the cluster via http://seed failed (attempt 1)",
+        "joining the cluster via http://seed failed (attempt 2)",
+    ]
+
+
+def test_peer_events_reach_local_subscribers_only_with_the_secret(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from main import create_app
+
+    monkeypatch.setenv("MOCK_NODE_URL", "http://127.0.0.1:8201")
+    monkeypatch.setenv("MOCK_CLUSTER_SECRET", "s3cret")
+    app = create_app()
+    client = TestClient(app)
+    event = {"topic": "S1", "key": "acc-x", "frame": "event: accumulator\nid: acc-x\ndata: {}\n\n"}
+
+    assert client.post("/t/team/cluster/events", json=event).status_code == 403
+    response = client.post("/t/team/cluster/events", json=event, headers={"X-Mock-Forwarded": "s3cret"})
+    assert response.status_code == 200
+    team = app.state.tenants.get("team")
+    assert team.events.latest["S1"] == {"acc-x": event["frame"].encode()}
+    assert "S1" not in app.state.events.latest
@@ -0,0 +1,31 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from main import create_app
+
+
+@pytest.fixture
+def client():
+    client = TestClient(create_app())
+    yield client
+    client.delete("/debug/memory/snapshots")
+
+
+@pytest.mark.parametrize("frames", [0, -1, 100000])
+def test_snapshot_frames_out_of_range_are_rejected(client, frames):
+    assert client.post("/debug/memory/snapshots/a", params={"frames": frames}).status_code == 422
+
+
+def test_snapshots_can_be_taken_and_compared(client):
+    assert client.post("/debug/memory/snapshots/a", params={"frames": 2}).status_code == 200
+    assert client.post("/debug/memory/snapshots/b").status_code == 200
+    assert client.get("/debug/memory/diff", params={"before": "a", "after": "b"}).status_code == 200
+    assert client.get("/debug/memory/snapshots/missing").status_code == 404
+
+
+def test_memory_report_covers_the_tenant_catalog(client):
+    report = client.get("/debug/memory", params={"top": 3}).json()
+
+    assert report["scenarios"]["count"] == 11
+    assert len(report["scenarios"]["largest"]) == 3
+    assert set(report["indexes"]) == {"member", "coverage", "names"}
@@ -0,0 +1,74 @@
+import asyncio
+
+import events
+from events import Broadcaster, accumulator_event
+from scenarios import ACCUM, ScenarioRegistry
+
+
+def test_subscribers_receive_only_their_topic():
+    broadcaster = Broadcaster()
+    a, b = broadcaster.subscribe("A"), broadcaster.subscribe("B")
+    broadcaster.publish("A", "acc-1", b"one")
+
+    assert a.drain() == b"one"
+    assert b.drain() == b"" and not b.wakeup.is_set()
+
+
+def test_pending_frames_coalesce_to_the_latest_per_key():
+    broadcaster = Broadcaster()
+    subscription = broadcaster.subscribe("A")
+    for frame in (b"v1", b"v2", b"v3"):
+        broadcaster.publish("A", "acc-1", frame)
+    broadcaster.publish("A", "acc-2", b"other")
+
+    assert subscription.drain() == b"v3other"
+    assert subscription.drain() == b""
+
+
+def test_new_subscribers_get_the_latest_state_and_moved_keys_leave_their_old_topic():
+    broadcaster = Broadcaster()
+    broadcaster.publish("A", "acc-1", b"v1")
+    broadcaster.publish("B", "acc-1", b"v2")
+    broadcaster.publish("A", "acc-2", b"w1")
+    broadcaster.publish(None, "acc-2", b"w2")
+
+    assert broadcaster.subscribe("A").drain() == b""
+    assert broadcaster.subscribe("B").drain() == b"v2"
+
+
+def test_unsubscribing_the_last_subscriber_drops_the_topic():
+    broadcaster = Broadcaster()
+    subscription = broadcaster.subscribe("A")
+    broadcaster.unsubscribe("A", subscription)
+    assert broadcaster.topics == {}
+
+
+def test_registered_accumulators_are_published_to_their_subscriber():
+    registry = ScenarioRegistry()
+    broadcaster = Broadcaster()
+    registry.add_listener(broadcaster.publish_accumulator)
+    scenario = registry.get(ACCUM, "acc-succ")
+    topic, key, frame = accumulator_event(scenario)
+
+    assert (topic, key) == ("123456789", "acc-succ")
+    assert frame.startswith(b"event: accumulator\nid: acc-succ\ndata: {\"scenarioId\":\"acc-succ\",\"accums\":")
+    assert frame.endswith(scenario.encoded + b"}\n\n")
+    assert broadcaster.latest[topic]["acc-succ"] == frame
+
+
+def test_stream_yields_current_state_then_changes_and_keepalives(monkeypatch):
+    monkeypatch.setattr(events, "KEEPALIVE_SECONDS", 0.01)
+    broadcaster = Broadcaster()
+    broadcaster.publish("A", "acc-1", b"v1")
+
+    async def run():
+        stream = broadcaster.stream("A")
+        chunks = [await stream.__anext__()]
+        chunks.append(await stream.__anext__())
+        broadcaster.publish("A", "acc-1", b"v2")
+        chunks.append(await stream.__anext__())
+        await stream.aclose()
+        return chunks
+
+    assert asyncio.run(run()) == [b"v1", b": keepalive\n\n", b"v2"]
+    assert broadcaster.topics == {}
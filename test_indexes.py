@@ -0,0 +1,50 @@
+from indexes import RecordIndex
+from scenarios import MEMBER, RECORD_KEYS, ScenarioRegistry
+
+
+def _members(*rows):
+    return {RECORD_KEYS[MEMBER]: [{"subscriberID": sid, "groupNumber": group} for sid, group in rows]}
+
+
+def _index(registry):
+    index = RecordIndex(MEMBER)
+    registry.add_listener(index.index_scenario)
+    return index
+
+
+def test_exact_and_prefix_search_across_scenarios():
+    registry = ScenarioRegistry(load_defaults=False)
+    index = _index(registry)
+    registry.register(MEMBER, "s1", _members(("A2", "G1"), ("B1", "G1")))
+    registry.register(MEMBER, "s2", _members(("A1", "G2")))
+
+    assert list(index.search({"groupNumber": "G1"}, 10)) == [("s1", 0), ("s1", 1)]
+    assert index.search({"subscriberID": "A*"}, 10) == [("s2", 0), ("s1", 0)]
+    assert index.search({"subscriberID": "A*", "groupNumber": "G1"}, 10) == [("s1", 0)]
+
+
+def test_replacing_a_scenario_drops_its_old_records():
+    registry = ScenarioRegistry(load_defaults=False)
+    index = _index(registry)
+    registry.register(MEMBER, "s1", _members(("A1", "G1"), ("A2", "G1")))
+    registry.register(MEMBER, "s2", _members(("A3", "G1")))
+    registry.register(MEMBER, "s1", _members(("C1", "G9")))
+
+    assert index.search({"subscriberID": "A*"}, 10) == [("s2", 0)]
+    assert index.search({"groupNumber": "G1"}, 10) == [("s2", 0)]
+    assert index.search({"subscriberID": "C1"}, 10) == [("s1", 0)]
+    assert index.indexes["subscriberID"].values() == ["A3", "C1"]
+
+
+def test_prefix_queries_see_values_added_and_removed_since_the_last_query():
+    registry = ScenarioRegistry(load_defaults=False)
+    index = _index(registry)
+    registry.register(MEMBER, "s1", _members(("A2", "G1")))
+    assert index.search({"subscriberID": "A*"}, 10) == [("s1", 0)]
+
+    registry.register(MEMBER, "s2", _members(("A1", "G1"), ("A2", "G2")))
+    registry.register(MEMBER, "s1", _members(("B1", "G1")))
+    registry.register(MEMBER, "s1", _members(("A2", "G1")))
+
+    assert index.search({"subscriberID": "A*"}, 10) == [("s2", 0), ("s2", 1), ("s1", 0)]
+    assert index.indexes["subscriberID"].values() == ["A1", "A2"]
@@ -0,0 +1,75 @@
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from intervals import IntervalTree, as_of_scenario
+from main import create_app
+from scenarios import COVERAGE, MAX_VARIANTS, ScenarioRegistry
+
+
+@pytest.fixture
+def client():
+    return TestClient(create_app())
+
+
+def test_stab_returns_every_interval_containing_the_point():
+    tree = IntervalTree([("2024-01-01", "2024-12-31", "a"), ("2024-06-01", "2025-06-01", "b"),
+                         ("2025-01-01", "2025-12-31", "c")])
+
+    assert sorted(tree.stab("2024-07-01")) == ["a", "b"]
+    assert sorted(tree.stab("2025-03-01")) == ["b", "c"]
+    assert tree.stab("2023-01-01") == []
+
+
+@pytest.mark.parametrize("period", [
+    {"start": "2025-01-01", "end": "2024-01-01"},
+    {"start": 1, "end": "2024-01-01"},
+    {"start": "2024-01-01", "end": ["2025-01-01"]},
+    "2024",
+])
+def test_malformed_coverage_periods_are_never_active(client, period):
+    payload = {"coverages": [{"coveragePeriod": period}, {"coveragePeriod": {"start": "2024-01-01", "end": "2024-12-31"}}]}
+
+    assert client.put("/scenarios/coverage/x", json=payload).status_code == 200
+    response = client.get("/searchCoverageById/x", params={"asOf": "2024-06-01"})
+    assert response.status_code == 200
+    assert response.json()["coverages"] == payload["coverages"][1:]
+
+
+@pytest.mark.parametrize("detail", ["x", ["x", 1], [{"coveragePeriod": "x"}]])
+def test_malformed_medicare_details_are_ignored(client, detail):
+    member = {"memberEffective": {"startDate": "2024-01-01", "endDate": "2024-12-31"}, "medicareDetail": detail}
+
+    assert client.put("/scenarios/member/x", json={"members": [member]}).status_code == 200
+    response = client.get("/searchMemberById/x", params={"asOf": "2024-06-01"})
+    assert response.status_code == 200
+    expected = member if isinstance(detail, str) else {**member, "medicareDetail": []}
+    assert response.json()["members"] == [expected]
+
+
+def test_period_index_survives_many_as_of_views():
+    registry = ScenarioRegistry()
+    scenario = registry.register(COVERAGE, "x", {"coverages": [
+        {"coveragePeriod": {"start": "2024-01-01", "end": "2024-12-31"}},
+    ]})
+    as_of_scenario(scenario, "2024-01-01")
+    index = scenario.cached()["periods"]
+
+    for day in range(MAX_VARIANTS * 2):
+        as_of_scenario(scenario, (date(2024, 1, 1) + timedelta(days=day)).isoformat())
+
+    assert scenario.cached()["periods"] is index
+
+
+def test_variants_are_evicted_least_recently_used_first():
+    registry = ScenarioRegistry()
+    scenario = registry.register(COVERAGE, "x", {"coverages": []})
+    scenario.derived("hot", lambda: "hot")
+    for n in range(MAX_VARIANTS - 1):
+        scenario.derived(n, lambda: n)
+    scenario.derived("hot", lambda: "rebuilt")
+    scenario.derived("new", lambda: "new")
+
+    assert scenario.derived("hot", lambda: "rebuilt") == "hot"
+    assert 0 not in scenario.cached()
@@ -0,0 +1,26 @@
+from main import create_app
+
+
+def test_openapi_documents_lookup_response_models():
+    schema = create_app().openapi()
+
+    assert {"MemberResponse", "CoverageResponse", "AccumulatorResponse", "FailedAccumulatorResponse",
+            "ErrorResponse"} <= set(schema["components"]["schemas"])
+    member = schema["paths"]["/searchMemberById/{member_id}"]["get"]["responses"]["200"]
+    refs = [option["$ref"] for option in member["content"]["application/json"]["schema"]["anyOf"]]
+    assert refs == ["#/components/schemas/MemberResponse", "#/components/schemas/ErrorResponse"]
+
+
+def test_default_tenant_gets_the_tenant_budgets():
+    from fastapi.testclient import TestClient
+
+    from ratelimit import RateLimit
+    from tenants import TenantConfig
+
+    config = TenantConfig(cache_max_bytes=4096, scenario_max_bytes=16, quota=RateLimit(1, 2))
+    app = create_app(tenant_config=config)
+    client = TestClient(app)
+
+    assert app.state.response_cache.max_bytes == 4096
+    assert client.put("/scenarios/member/big", json={"members": [{"name": "x" * 32}]}).status_code == 413
+    assert [client.get("/searchMemberById/m-a").status_code for _ in range(2)] == [200, 429]
@@ -0,0 +1,70 @@
+import pytest
+
+import ngrams
+from ngrams import NameIndex, member_name, normalize, trigrams
+from scenarios import MEMBER, ScenarioRegistry
+
+
+def _member(first, last, group="A"):
+    return {"groupNumber": group, "name": {"normalizedName": {"normalizedFirstName": first, "normalizedLastName": last}}}
+
+
+def _index(*members):
+    registry = ScenarioRegistry(load_defaults=False)
+    index = NameIndex()
+    registry.add_listener(index.index_scenario)
+    registry.register(MEMBER, "s", {"members": list(members)})
+    return index
+
+
+def test_names_normalize_to_padded_word_trigrams():
+    assert normalize(" o'Brien-smith ") == "O BRIEN SMITH"
+    assert trigrams("TED") == {"  T", " TE", "TED", "ED "}
+
+
+@pytest.mark.parametrize("name", ["bob", ["bob"], {"normalizedName": "bob"}, {"memberName": "bob"},
+                                  {"normalizedName": {"normalizedFirstName": 7}, "memberName": {"fullName": 7}}])
+def test_malformed_names_are_not_indexed(name):
+    assert member_name({"name": name}) == ""
+    assert _index({"name": name}).search("bob", 10) == []
+
+
+def test_full_name_is_used_without_normalized_parts():
+    assert member_name({"name": {"memberName": {"fullName": "Ann Lee"}}}) == "ANN LEE"
+
+
+def test_ranking_prefers_prefix_then_similarity_and_tolerates_typos():
+    index = _index(_member("JOHNSON", "SMITHERS"), _member("JOHN", "SMITH"), _member("MARY", "JONES"))
+
+    assert index.search("john smith", 2) == [("s", 1), ("s", 0)]
+    assert index.search("jon smith", 1) == [("s", 1)]
+    assert index.search("joh", 10)[:2] == [("s", 1), ("s", 0)]
+
+
+def test_criteria_are_applied_before_the_candidate_cap(monkeypatch):
+    monkeypatch.setattr(ngrams, "MAX_CANDIDATES", 3)
+    members = [_member("JOHN", "SMITH", group="A") for _ in range(10)] + [_member("JOHN", "SMITH", group="B")]
+    index = _index(*members)
+
+    assert index.search("john smith", 10, accept=lambda ref: members[ref[1]]["groupNumber"] == "B") == [("s", 10)]
+
+
+def test_replacing_a_scenario_reindexes_its_names():
+    registry = ScenarioRegistry(load_defaults=False)
+    index = NameIndex()
+    registry.add_listener(index.index_scenario)
+    registry.register(MEMBER, "s", {"members": [_member("ANN", "LEE")]})
+    registry.register(MEMBER, "s", {"members": [_member("BOB", "KAY")]})
+
+    assert index.search("ann lee", 10) == []
+    assert index.search("bob kay", 10) == [("s", 0)]
+
+
+def test_registering_a_member_with_a_plain_string_name_succeeds():
+    from fastapi.testclient import TestClient
+
+    from main import create_app
+
+    client = TestClient(create_app())
+    assert client.put("/scenarios/member/x", json={"members": [{"name": "bob", "groupNumber": "G"}]}).status_code == 200
+    assert client.get("/searchMembers", params={"groupNumber": "G"}).json() == {"members": [{"name": "bob", "groupNumber": "G"}]}
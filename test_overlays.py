@@ -0,0 +1,71 @@
+import copy
+
+from fixtures import MEMBER_RESPONSE_MA
+from overlays import REMOVE, InternTable, overlay
+from scenarios import MEMBER, ScenarioRegistry, encode
+
+
+def test_overlay_copies_only_the_patched_path():
+    base = {"a": {"b": [1, {"c": 2}], "d": {"e": 3}}, "f": 4}
+    original = copy.deepcopy(base)
+    patched = overlay(base, {"a/b/1/c": 9, "a/new": "x", "f": REMOVE})
+
+    assert patched == {"a": {"b": [1, {"c": 9}], "d": {"e": 3}, "new": "x"}}
+    assert base == original
+    assert patched["a"]["d"] is base["a"]["d"]
+    assert list(patched["a"]) == ["b", "d", "new"]
+
+
+def test_remove_deletes_list_items():
+    assert overlay({"l": [1, 2, 3]}, {"l/1": REMOVE}) == {"l": [1, 3]}
+
+
+def test_identical_subtrees_are_interned_to_one_object():
+    table = InternTable()
+    first = table.intern({"x": {"y": [1, 2]}, "z": "a"})
+    second = table.intern({"x": {"y": [1, 2]}, "z": "b"})
+
+    assert first["x"] is second["x"]
+    assert table.stats()["sharedSubtrees"] >= 1
+
+
+def test_equal_but_differently_encoded_values_are_kept_apart():
+    table = InternTable()
+    values = [table.intern({"v": value}) for value in (0.0, -0.0, 0, False, 1, True, 1.0)]
+
+    assert [encode(value) for value in values] == [
+        b'{"v":0.0}', b'{"v":-0.0}', b'{"v":0}', b'{"v":false}', b'{"v":1}', b'{"v":true}', b'{"v":1.0}',
+    ]
+    assert [table.encode(value) for value in values] == [encode(value) for value in values]
+
+
+def test_encode_is_byte_identical_to_scenarios_encode():
+    table = InternTable()
+    payloads = [
+        table.intern(MEMBER_RESPONSE_MA),
+        table.intern(overlay(MEMBER_RESPONSE_MA, {"members/0/masterRecordID": REMOVE})),
+        table.intern({"text": "naïve   \"quoted\"", "n": [None, 1.5, {"k": []}], 3: "int key"}),
+    ]
+    for _ in range(2):
+        # The second pass serves the cached bytes of shared subtrees
+        assert [table.encode(payload) for payload in payloads] == [encode(payload) for payload in payloads]
+
+
+def test_encoding_stays_identical_after_compaction(monkeypatch):
+    import scenarios
+
+    monkeypatch.setattr(scenarios, "MIN_COMPACT_REPLACEMENTS", 2)
+    registry = ScenarioRegistry(load_defaults=False)
+    compactions = []
+    compact = registry._compact
+    monkeypatch.setattr(registry, "_compact", lambda: compactions.append(1) or compact())
+    shared = {"plan": {"name": "GOLD", "tiers": [1, 2, 3]}}
+    for revision in range(6):
+        registry.register(MEMBER, "a", {"members": [{"rev": revision, **shared}]})
+        registry.register(MEMBER, "b", {"members": [{"rev": -revision, **shared}]})
+    table = registry.interned
+
+    assert compactions
+    for scenario in registry.scenarios():
+        assert scenario.encoded == encode(scenario.payload)
+        assert table.encode(scenario.payload) == encode(scenario.payload)
@@ -0,0 +1,38 @@
+import base64
+import json
+
+import pytest
+
+from pagination import decode_cursor, encode_cursor, page_body
+from scenarios import MEMBER, ScenarioRegistry
+
+
+@pytest.mark.parametrize("raw", [b"1:zz", b"1", b"1:2:3", b"x:1", b"-1:0"])
+def test_malformed_cursors_are_invalid(raw):
+    cursor = base64.urlsafe_b64encode(raw).decode()
+    with pytest.raises(ValueError, match="^invalid cursor$"):
+        decode_cursor(cursor, 0)
+
+
+def test_cursor_round_trip_and_checksum_mismatch():
+    assert decode_cursor(encode_cursor(7, 0xBEEF), 0xBEEF) == 7
+    with pytest.raises(ValueError, match="does not match"):
+        decode_cursor(encode_cursor(7, 0xBEEF), 0xCAFE)
+
+
+def test_pages_keep_the_other_top_level_keys():
+    registry = ScenarioRegistry()
+    payload = {"requestId": "r-1", "members": [{"n": n} for n in range(5)], "total": 5}
+    scenario = registry.register(MEMBER, "paged", payload)
+
+    pages, cursor = [], None
+    while True:
+        page = json.loads(page_body(scenario, 2, cursor))
+        pages.append(page)
+        cursor = page["nextCursor"]
+        if cursor is None:
+            break
+
+    assert [list(page) for page in pages] == [["requestId", "members", "total", "nextCursor"]] * 3
+    assert [record for page in pages for record in page["members"]] == payload["members"]
+    assert all(page["requestId"] == "r-1" and page["total"] == 5 for page in pages)
@@ -0,0 +1,18 @@
+import math
+import time
+
+import pytest
+
+from profiler import sample
+
+
+@pytest.mark.parametrize("seconds, interval", [(math.inf, 0.005), (math.nan, 0.005), (0.1, math.inf), (0.1, math.nan)])
+def test_non_finite_arguments_are_rejected(seconds, interval):
+    with pytest.raises(ValueError):
+        sample(seconds, interval)
+
+
+def test_a_long_interval_does_not_outlast_the_deadline():
+    started = time.monotonic()
+    sample(0.1, 1e9)
+    assert time.monotonic() - started < 0.5
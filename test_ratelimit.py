@@ -0,0 +1,96 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from ratelimit import RateLimit, RateLimitConfig, TokenBucketTable
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bucket_allows_burst_then_reports_wait():
+    clock = FakeClock()
+    table = TokenBucketTable(RateLimit(rate=2, burst=3), clock=clock)
+    assert [table.take("a") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert table.take("a") == pytest.approx(0.5)
+    clock.now = 0.5
+    assert table.take("a") == 0.0
+
+
+def test_buckets_are_per_client():
+    table = TokenBucketTable(RateLimit(rate=1, burst=1), clock=FakeClock())
+    assert table.take("a") == 0.0
+    assert table.take("a") > 0
+    assert table.take("b") == 0.0
+
+
+def test_idle_buckets_are_evicted():
+    clock = FakeClock()
+    table = TokenBucketTable(RateLimit(rate=1, burst=1), idle_ttl=10, clock=clock)
+    for client in "abc":
+        table.take(client)
+    clock.now = 100
+    table.take("d")
+    assert len(table) == 1
+
+
+def test_parse_rejects_invalid_limits():
+    assert RateLimit.parse("10:20") == RateLimit(10.0, 20.0)
+    assert RateLimit.parse("5") == RateLimit(5.0, 5.0)
+    with pytest.raises(ValueError):
+        RateLimit.parse("0")
+
+
+def test_default_limit_returns_429_with_retry_after():
+    client = TestClient(main.create_app(rate_limits=RateLimitConfig(default=RateLimit(1, 1))))
+    responses = [client.get("/searchAccums/acc-succ") for _ in range(3)]
+    assert [response.status_code for response in responses] == [200, 429, 429]
+    assert responses[1].headers["retry-after"] == "1"
+    assert responses[1].json() == {"detail": "Too Many Requests"}
+
+
+def test_route_limit_applies_only_to_its_prefix():
+    config = RateLimitConfig(routes=(("/searchAccums", RateLimit(1, 1)),))
+    client = TestClient(main.create_app(rate_limits=config))
+    assert [client.get("/searchAccums/acc-succ").status_code for _ in range(2)] == [200, 429]
+    assert client.get("/searchMemberById/m-a").status_code == 200
+
+
+def test_rejected_requests_spend_no_tokens():
+    config = RateLimitConfig(default=RateLimit(0.001, 3), routes=(("/searchAccums", RateLimit(0.001, 1)),))
+    client = TestClient(main.create_app(rate_limits=config))
+    assert [client.get("/searchAccums/acc-succ").status_code for _ in range(3)] == [200, 429, 429]
+    assert [client.get("/searchMemberById/m-a").status_code for _ in range(3)] == [200, 200, 429]
+
+
+def test_check_does_not_consume():
+    table = TokenBucketTable(RateLimit(rate=1, burst=1), clock=FakeClock())
+    assert [table.check("a"), table.check("a")] == [0.0, 0.0]
+    table.spend("a")
+    assert table.check("a") == pytest.approx(1.0)
+
+
+def test_clients_are_limited_separately():
+    client = TestClient(main.create_app(rate_limits=RateLimitConfig(default=RateLimit(1, 1))))
+    assert client.get("/", headers={"X-Client-Id": "a"}).status_code == 200
+    assert client.get("/", headers={"X-Client-Id": "a"}).status_code == 429
+    assert client.get("/", headers={"X-Client-Id": "b"}).status_code == 200
+
+
+def test_forwarded_header_is_ignored_without_cluster():
+    client = TestClient(main.create_app(rate_limits=RateLimitConfig(default=RateLimit(1, 1))))
+    headers = {"X-Mock-Forwarded": "1"}
+    assert [client.get("/", headers=headers).status_code for _ in range(2)] == [200, 429]
+
+
+def test_forwarded_header_needs_the_cluster_secret(monkeypatch):
+    monkeypatch.setenv("MOCK_NODE_URL", "http://127.0.0.1:8001")
+    monkeypatch.setenv("MOCK_CLUSTER_SECRET", "s3cret")
+    client = TestClient(main.create_app(rate_limits=RateLimitConfig(default=RateLimit(1, 1))))
+    assert [client.get("/", headers={"X-Mock-Forwarded": "1"}).status_code for _ in range(2)] == [200, 429]
+    assert client.get("/", headers={"X-Mock-Forwarded": "s3cret"}).status_code == 200
@@ -0,0 +1,51 @@
+import asyncio
+import json
+
+from fastapi import FastAPI
+
+from replay import ReplayReport, build_client, iter_requests, replay
+
+
+def _log(tmp_path, *entries):
+    path = tmp_path / "traffic.ndjson"
+    path.write_text("".join((entry if isinstance(entry, str) else json.dumps(entry)) + "\n" for entry in entries))
+    return str(path)
+
+
+def test_malformed_lines_are_counted_and_skipped(tmp_path):
+    log = _log(
+        tmp_path,
+        {"path": "/ok", "headers": {"X-Mock-Tenant": "a"}},
+        "not json",
+        [1, 2],
+        {"method": "GET"},
+        {"path": 42},
+        {"path": "/bad-header", "headers": {"X-Count": 1}},
+        {"path": "/bad-headers", "headers": ["X-Count"]},
+    )
+    report = ReplayReport()
+
+    assert [request.path for request in iter_requests(log, report)] == ["/ok"]
+    assert report.skipped_lines == 6
+
+
+def test_app_exceptions_are_counted_without_ending_the_replay(tmp_path):
+    app = FastAPI()
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    @app.get("/ok")
+    async def ok():
+        return {}
+
+    log = _log(tmp_path, {"path": "/boom"}, {"path": "/ok"}, {"path": "/boom"})
+
+    async def run():
+        async with build_client(app=app) as client:
+            return await replay(log, client, speed=None)
+
+    report = asyncio.run(run())
+    assert report.errors == {"RuntimeError": 2}
+    assert report.statuses == {200: 1}